@@ -0,0 +1,33 @@
+"""
+Demo Price Walk Kernel
+Sequential trend/price simulation used by the demo market data generator
+"""
+
+from _njit import njit
+
+
+@njit(cache=True)
+def _walk(noise, trend_str, flips, base, cur, direction, out_prices, out_changes):
+    """
+    Advance the simulated price one bar at a time
+    Fuses trend flips, price accumulation and the 0.7x/1.4x base clamp in one pass.
+    Returns the final (price, trend_direction) so the caller can keep its state.
+    """
+    lower = base * 0.7
+    upper = base * 1.4
+    for i in range(noise.shape[0]):
+        if flips[i]:
+            direction = -direction
+        
+        change = direction * trend_str[i] * 0.001 + noise[i]
+        cur *= 1.0 + change
+        
+        if cur < lower:
+            direction = 1
+        elif cur > upper:
+            direction = -1
+        
+        out_prices[i] = cur
+        out_changes[i] = change
+    
+    return cur, direction
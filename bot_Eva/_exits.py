@@ -0,0 +1,28 @@
+"""
+Exit Condition Kernels
+Stop loss / take profit checks for a single position (live path) and for
+many positions at once (batch backtests over parallel arrays)
+"""
+
+import numpy as np
+
+from _njit import njit
+
+
+@njit(cache=True, fastmath=True)
+def check_exits(price, side_is_buy, stop_loss, take_profit):
+    """Return (stop_hit, target_hit) for one position"""
+    if side_is_buy:
+        return price <= stop_loss, price >= take_profit
+    return price >= stop_loss, price <= take_profit
+
+
+@njit(cache=True)
+def check_exits_batch(prices, sides_is_buy, stop_losses, take_profits):
+    """
+    Vectorized check_exits over parallel arrays (one element per position)
+    Returns (stop_mask, target_mask) boolean arrays
+    """
+    stop_mask = np.where(sides_is_buy, prices <= stop_losses, prices >= stop_losses)
+    target_mask = np.where(sides_is_buy, prices >= take_profits, prices <= take_profits)
+    return stop_mask, target_mask
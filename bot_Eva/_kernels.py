@@ -0,0 +1,210 @@
+"""
+Indicator Kernels
+Single-pass computation of every indicator used by the strategy
+"""
+
+import numpy as np
+
+from _njit import njit
+
+
+# Order of the values returned by compute_indicators
+INDICATOR_NAMES = (
+    'ema_200', 'macd', 'macd_signal', 'macd_histogram',
+    'rsi', 'atr', 'volume_ratio', 'adx'
+)
+
+
+@njit(cache=True)
+def _ewm(prev, value, alpha):
+    """One step of an exponentially weighted mean (pandas adjust=False recurrence)"""
+    if prev == value:
+        return prev
+    old = 1.0 - alpha
+    return (old * prev + alpha * value) / (old + alpha)
+
+
+@njit(cache=True)
+def smoothing_params(ema_p, macd_f, macd_s, macd_sig, rsi_p, atr_p, adx_p, vol_p):
+    """
+    Precompute the step()/run_bars() parameters from indicator periods
+    EMA alphas are 2/(p+1) and the RSI (Wilder) alpha is 1/p. ATR and ADX keep
+    their integer periods: ta divides by p at every bar, and folding that into
+    a precomputed factor would change the rounding.
+    """
+    return (2.0 / (ema_p + 1), 2.0 / (macd_f + 1), 2.0 / (macd_s + 1),
+            2.0 / (macd_sig + 1), 1.0 / rsi_p, macd_s, atr_p, adx_p, vol_p)
+
+
+# Slots of the streaming state vector used by step()
+(N_BARS, PREV_HIGH, PREV_LOW, PREV_CLOSE, EMA, EMA_FAST, EMA_SLOW, MACD_SIGNAL,
+ AVG_GAIN, AVG_LOSS, TR_SUM, ATR, DM_TR, DM_PLUS, DM_MINUS, DX_SUM, ADX,
+ VOLUME_SUM, LAST_VOLUME) = range(19)
+STATE_SIZE = 19
+
+
+@njit(cache=True)
+def new_state(vol_p):
+    """Return an empty (state, volume ring) pair for step()"""
+    state = np.zeros(STATE_SIZE)
+    state[ADX] = np.nan
+    return state, np.zeros(vol_p)
+
+
+@njit(cache=True)
+def step(state, ring, h, l, c, v, ema_alpha, fast_alpha, slow_alpha, sig_alpha,
+         rsi_alpha, macd_s, atr_p, adx_p, vol_p):
+    """
+    Advance every indicator by one bar, updating state and ring in place
+    Uses the same recurrences and warm-up windows as the ta library, so the
+    values match the ta/pandas implementation on the same history.
+    Smoothing factors come precomputed (see smoothing_params).
+    """
+    i = int(state[N_BARS])
+
+    # Volume moving average (running sum over a ring of the last vol_p bars)
+    slot = i % vol_p
+    if i >= vol_p:
+        state[VOLUME_SUM] -= ring[slot]
+    ring[slot] = v
+    state[VOLUME_SUM] += v
+    state[LAST_VOLUME] = v
+
+    if i == 0:
+        state[EMA] = c
+        state[EMA_FAST] = c
+        state[EMA_SLOW] = c
+        true_range = h - l
+    else:
+        prev_close = state[PREV_CLOSE]
+
+        # EMA 200 and MACD
+        state[EMA] = _ewm(state[EMA], c, ema_alpha)
+        state[EMA_FAST] = _ewm(state[EMA_FAST], c, fast_alpha)
+        state[EMA_SLOW] = _ewm(state[EMA_SLOW], c, slow_alpha)
+
+        # RSI (Wilder smoothing of gains and losses)
+        diff = c - prev_close
+        state[AVG_GAIN] = _ewm(state[AVG_GAIN], diff if diff > 0 else 0.0, rsi_alpha)
+        state[AVG_LOSS] = _ewm(state[AVG_LOSS], -diff if diff < 0 else 0.0, rsi_alpha)
+
+        true_range = max(h - l, abs(h - prev_close), abs(l - prev_close))
+
+        # ADX (directional movement smoothed over adx_p bars)
+        move_up = h - state[PREV_HIGH]
+        move_down = state[PREV_LOW] - l
+        plus_dm = move_up if move_up > move_down and move_up > 0 else 0.0
+        minus_dm = move_down if move_down > move_up and move_down > 0 else 0.0
+        directional_range = max(h, prev_close) - min(l, prev_close)
+
+        if i <= adx_p:
+            state[DM_TR] += directional_range
+            state[DM_PLUS] += plus_dm
+            state[DM_MINUS] += minus_dm
+        else:
+            state[DM_TR] = state[DM_TR] - state[DM_TR] / adx_p + directional_range
+            state[DM_PLUS] = state[DM_PLUS] - state[DM_PLUS] / adx_p + plus_dm
+            state[DM_MINUS] = state[DM_MINUS] - state[DM_MINUS] / adx_p + minus_dm
+
+        if i >= adx_p:
+            dm_tr = state[DM_TR]
+            di_plus = 100 * (state[DM_PLUS] / dm_tr) if dm_tr != 0 else 0.0
+            di_minus = 100 * (state[DM_MINUS] / dm_tr) if dm_tr != 0 else 0.0
+            di_sum = di_plus + di_minus
+            dx = 100 * abs((di_plus - di_minus) / di_sum) if di_sum != 0 else 0.0
+
+            dx_count = i - adx_p + 1
+            if dx_count < adx_p:
+                state[DX_SUM] += dx
+            elif dx_count == adx_p:
+                state[ADX] = (state[DX_SUM] + dx) / adx_p
+            else:
+                state[ADX] = (state[ADX] * (adx_p - 1) + dx) / adx_p
+
+    # MACD signal line starts at the first complete MACD value
+    if i == macd_s - 1:
+        state[MACD_SIGNAL] = state[EMA_FAST] - state[EMA_SLOW]
+    elif i >= macd_s:
+        state[MACD_SIGNAL] = _ewm(state[MACD_SIGNAL], state[EMA_FAST] - state[EMA_SLOW], sig_alpha)
+
+    # ATR (simple mean of the first atr_p ranges, then Wilder smoothing)
+    if i < atr_p:
+        state[TR_SUM] += true_range
+        if i == atr_p - 1:
+            state[ATR] = state[TR_SUM] / atr_p
+    else:
+        state[ATR] = (state[ATR] * (atr_p - 1) + true_range) / atr_p
+
+    state[PREV_HIGH] = h
+    state[PREV_LOW] = l
+    state[PREV_CLOSE] = c
+    state[N_BARS] = i + 1
+
+
+@njit(cache=True)
+def state_values(state, ema_p, macd_s, macd_sig, rsi_p, atr_p, vol_p):
+    """Current indicator values (INDICATOR_NAMES order); NaN until warmed up"""
+    n = state[N_BARS]
+    nan = np.nan
+
+    if state[AVG_LOSS] == 0:
+        rsi = 100.0
+    else:
+        rsi = 100 - (100 / (1 + state[AVG_GAIN] / state[AVG_LOSS]))
+
+    macd = state[EMA_FAST] - state[EMA_SLOW] if n >= macd_s else nan
+    macd_signal = state[MACD_SIGNAL] if n >= macd_s + macd_sig - 1 else nan
+    volume_ratio = state[LAST_VOLUME] / (state[VOLUME_SUM] / vol_p) if n >= vol_p else nan
+
+    return (
+        state[EMA] if n >= ema_p else nan,
+        macd,
+        macd_signal,
+        macd - macd_signal,
+        rsi if n >= rsi_p else nan,
+        state[ATR] if n >= atr_p else nan,
+        volume_ratio,
+        state[ADX]
+    )
+
+
+@njit(cache=True)
+def run_bars(state, ring, high, low, close, volume, ema_alpha, fast_alpha, slow_alpha,
+             sig_alpha, rsi_alpha, macd_s, atr_p, adx_p, vol_p):
+    """Step the state through a block of bars (warm-up / catch-up)"""
+    for i in range(close.shape[0]):
+        step(state, ring, high[i], low[i], close[i], volume[i], ema_alpha, fast_alpha,
+             slow_alpha, sig_alpha, rsi_alpha, macd_s, atr_p, adx_p, vol_p)
+
+
+@njit(cache=True)
+def compute_indicators(high, low, close, volume, ema_p, macd_f, macd_s, macd_sig,
+                       rsi_p, atr_p, adx_p, vol_p):
+    """
+    Compute the latest EMA, MACD, RSI, ATR, volume ratio and ADX in one pass
+    Values whose warm-up window is not complete are NaN.
+    """
+    state, ring = new_state(vol_p)
+    run_bars(state, ring, high, low, close, volume,
+             *smoothing_params(ema_p, macd_f, macd_s, macd_sig, rsi_p, atr_p, adx_p, vol_p))
+    return state_values(state, ema_p, macd_s, macd_sig, rsi_p, atr_p, vol_p)
+
+
+@njit(cache=True)
+def indicator_series(high, low, close, volume, ema_p, macd_f, macd_s, macd_sig,
+                     rsi_p, atr_p, adx_p, vol_p):
+    """
+    Indicator values after every bar, shape (n, len(INDICATOR_NAMES))
+    Row i equals compute_indicators over bars [0, i] (backtests).
+    """
+    ema_alpha, fast_alpha, slow_alpha, sig_alpha, rsi_alpha, _, _, _, _ = smoothing_params(
+        ema_p, macd_f, macd_s, macd_sig, rsi_p, atr_p, adx_p, vol_p)
+    state, ring = new_state(vol_p)
+    out = np.empty((close.shape[0], len(INDICATOR_NAMES)))
+    for i in range(close.shape[0]):
+        step(state, ring, high[i], low[i], close[i], volume[i], ema_alpha, fast_alpha,
+             slow_alpha, sig_alpha, rsi_alpha, macd_s, atr_p, adx_p, vol_p)
+        values = state_values(state, ema_p, macd_s, macd_sig, rsi_p, atr_p, vol_p)
+        for j in range(len(values)):
+            out[i, j] = values[j]
+    return out
@@ -0,0 +1,13 @@
+"""
+Numba JIT Shim
+Exposes numba's njit when it is installed and a no-op decorator otherwise
+"""
+
+try:
+    from numba import njit
+except ImportError:  # numba is an optional dependency
+    def njit(*args, **kwargs):
+        """Fallback decorator that returns the function unchanged"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -0,0 +1,65 @@
+"""
+Entry Signal Kernels
+Numeric core of the trend following entry conditions
+"""
+
+import numpy as np
+
+from _njit import njit
+
+
+# Conditions a direction must meet for an entry signal, one mask bit each
+ENTRY_CONDITIONS = 5
+ENTRY_TREND = 1 << 0     # price on the trade side of EMA 200
+ENTRY_MACD = 1 << 1      # MACD histogram in the trade direction
+ENTRY_RSI = 1 << 2       # RSI not overbought (BUY) / not oversold (SELL)
+ENTRY_VOLUME = 1 << 3    # volume ratio above the volume multiplier
+ENTRY_ADX = 1 << 4       # ADX at least the minimum trend strength
+ENTRY_ALL = (1 << ENTRY_CONDITIONS) - 1
+
+
+@njit(cache=True)
+def entry_masks(price, ema_200, macd_histogram, rsi, volume_ratio, volume_threshold,
+                adx, min_adx):
+    """
+    Return (bullish, bearish) masks of the entry conditions each side meets
+    A side triggers when its mask equals ENTRY_ALL; mask.bit_count() is the
+    number of conditions met. NaN inputs fail every comparison, so indicators
+    still warming up never complete a signal.
+    """
+    confirmed = int(volume_ratio > volume_threshold) << 3 | int(adx >= min_adx) << 4
+    bullish = (int(price > ema_200) | int(macd_histogram > 0) << 1
+               | int(rsi < 70) << 2 | confirmed)
+    bearish = (int(price < ema_200) | int(macd_histogram < 0) << 1
+               | int(rsi > 30) << 2 | confirmed)
+    return bullish, bearish
+
+
+@njit(cache=True)
+def entry_actions_batch(close, ema_200, macd_histogram, rsi, volume_ratio, volume_threshold,
+                        adx, min_adx):
+    """
+    Vectorized entry decision over parallel per-bar arrays
+    Returns an int8 array: 1 where every bullish condition holds (BUY), -1 where
+    every bearish one does (SELL), 0 otherwise. The two sides are exclusive
+    because they need price on opposite sides of EMA 200.
+    """
+    confirmed = (volume_ratio > volume_threshold) & (adx >= min_adx)
+    bullish = confirmed & (close > ema_200) & (macd_histogram > 0) & (rsi < 70)
+    bearish = confirmed & (close < ema_200) & (macd_histogram < 0) & (rsi > 30)
+    return bullish.astype(np.int8) - bearish.astype(np.int8)
+
+
+@njit(cache=True, fastmath=True)
+def book_depth(bids_qty, asks_qty, levels):
+    """
+    Total bid and ask quantity over the top levels of a columnar order book
+    Returns (bid_volume, ask_volume); levels past either side's depth are ignored.
+    """
+    bid_volume = 0.0
+    for i in range(min(levels, bids_qty.shape[0])):
+        bid_volume += bids_qty[i]
+    ask_volume = 0.0
+    for i in range(min(levels, asks_qty.shape[0])):
+        ask_volume += asks_qty[i]
+    return bid_volume, ask_volume
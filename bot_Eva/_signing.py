@@ -0,0 +1,18 @@
+"""
+Request Signing
+Builds HMAC-SHA256 signed query strings for the Binance REST API
+"""
+
+import hmac
+import time
+
+
+def sign_query(mac_template: hmac.HMAC, template: str, fields: tuple) -> str:
+    """
+    Fill a query template (timestamp slot last), sign it and append the signature
+    mac_template is a keyed HMAC whose state is copied instead of re-keyed per call.
+    """
+    query = template % (*fields, time.time_ns() // 1_000_000)
+    mac = mac_template.copy()
+    mac.update(query.encode())
+    return f"{query}&signature={mac.hexdigest()}"
@@ -6,13 +6,13 @@ Demonstra todas as funcionalidades do bot com dados simulados
 
 import asyncio
 import logging
-import random
 import time
 from datetime import datetime
 from typing import Dict, Any, List
-import pandas as pd
 import numpy as np
 
+from _demo_jit import _walk
+from _exits import check_exits
 from indicators import TechnicalIndicators
 from strategy import TrendFollowingStrategy
 from risk_manager import AdaptiveRiskManager
@@ -20,51 +20,72 @@ from logger_config import setup_logging
 from utils import load_config, validate_config
 
 
+# Chaves de stop loss / take profit do risk manager para cada lado
+_SIDE_KEYS = {
+    'BUY': ('stop_loss_long', 'take_profit_long'),
+    'SELL': ('stop_loss_short', 'take_profit_short'),
+}
+
+
+def _format_ms(timestamp_ms: int) -> str:
+    """Formata um timestamp em ms (só na hora de exibir)"""
+    return datetime.fromtimestamp(timestamp_ms / 1000).isoformat()
+
+
 class DemoMarketDataGenerator:
     """Gerador de dados de mercado realistas para demonstração"""
     
-    def __init__(self, base_price: float = 50000):
+    COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+    
+    def __init__(self, base_price: float = 50000, window: int = 500):
         self.base_price = base_price
         self.current_price = base_price
         self.trend_direction = 1  # 1 para alta, -1 para baixa
         self.volatility = 0.02
+        self.rng = np.random.default_rng()
+        
+        # Histórico pré-alocado: a janela visível é sempre uma fatia contígua
+        # buffer[end - window:end]; quando o buffer enche, a última janela é
+        # copiada para o início (custo amortizado O(1) por candle)
+        self.window = window
+        self.capacity = 4 * window
+        self._buffers = {
+            col: np.empty(self.capacity, dtype=np.int64 if col == 'timestamp' else np.float64)
+            for col in self.COLUMNS
+        }
+        self._end = 0
         
     def generate_realistic_data(self, periods: int = 500) -> Dict:
         """Gera dados de mercado realistas com tendências"""
-        timestamps = [int(time.time() * 1000) - (periods - i) * 300000 for i in range(periods)]
+        now = int(time.time() * 1000)
+        timestamps = now - np.arange(periods, 0, -1, dtype=np.int64) * 300000
+        rng = self.rng
         
-        prices = []
-        volumes = []
+        # Todos os sorteios de uma vez (ruído, força da tendência, mudanças de tendência)
+        noise = rng.normal(0, self.volatility, periods)
+        trend_strength = rng.uniform(0.3, 0.7, periods)
+        flips = rng.random(periods) < 0.005  # 0.5% chance de mudança de tendência
         
-        for i in range(periods):
-            # Mudança de tendência ocasional
-            if random.random() < 0.005:  # 0.5% chance de mudança de tendência
-                self.trend_direction *= -1
-                
-            # Movimento de preço com tendência
-            trend_strength = random.uniform(0.3, 0.7)
-            noise = random.gauss(0, self.volatility)
-            
-            change = (self.trend_direction * trend_strength * 0.001) + noise
-            self.current_price *= (1 + change)
-            
-            # Garante que o preço não fique muito extremo
-            if self.current_price < self.base_price * 0.7:
-                self.trend_direction = 1
-            elif self.current_price > self.base_price * 1.4:
-                self.trend_direction = -1
-                
-            prices.append(self.current_price)
-            
-            # Volume realista
-            base_volume = random.uniform(100, 500)
-            if abs(change) > 0.01:  # Volume maior em movimentos grandes
-                base_volume *= random.uniform(1.5, 3.0)
-            volumes.append(base_volume)
+        # Caminho de preço sequencial (mudança de tendência e limites de preço)
+        prices = np.empty(periods)
+        change = np.empty(periods)
+        price, direction = _walk(
+            noise, trend_strength, flips, float(self.base_price),
+            float(self.current_price), self.trend_direction, prices, change
+        )
+        self.current_price = float(price)
+        self.trend_direction = int(direction)
+        
+        # Volume realista, maior em movimentos grandes
+        volumes = rng.uniform(100, 500, periods)
+        big_moves = np.abs(change) > 0.01
+        volumes[big_moves] *= rng.uniform(1.5, 3.0, int(big_moves.sum()))
         
-        # Calcular high/low baseado nos preços close
-        highs = [p * random.uniform(1.0, 1.005) for p in prices]
-        lows = [p * random.uniform(0.995, 1.0) for p in prices]
+        # Calcular high/low baseado nos preços close (um único sorteio: linha 0
+        # para as máximas, linha 1 para as mínimas)
+        wicks = rng.uniform(0.0, 0.005, (2, periods))
+        highs = prices * (1 + wicks[0])
+        lows = prices * (1 - wicks[1])
         
         return {
             'timestamp': timestamps,
@@ -74,35 +95,76 @@ class DemoMarketDataGenerator:
             'close': prices,
             'volume': volumes
         }
+    
+    def append(self, k: int = 1) -> Dict:
+        """Acrescenta k novos candles ao histórico e retorna a janela atual (views, sem cópia)"""
+        if self._end == 0 or k >= self.window:
+            # Início a frio (ou salto maior que a janela): gera a janela inteira
+            bars = self.generate_realistic_data(self.window)
+            start = 0
+            k = self.window
+        else:
+            bars = self.generate_realistic_data(k)
+            # Mantém o espaçamento de 5 minutos a partir do último candle
+            last_ts = self._buffers['timestamp'][self._end - 1]
+            bars['timestamp'] = last_ts + np.arange(1, k + 1) * 300000
+            start = self._end
+            
+            if start + k > self.capacity:
+                keep = self.window - k
+                for buf in self._buffers.values():
+                    buf[:keep] = buf[start - keep:start]
+                start = keep
+        
+        end = start + k
+        for col, buf in self._buffers.items():
+            buf[start:end] = bars[col]
+        self._end = end
+        
+        lo = max(0, end - self.window)
+        return {col: buf[lo:end] for col, buf in self._buffers.items()}
 
 
 class DemoExecutor:
     """Executor simulado para demonstração"""
     
-    def __init__(self, initial_balance: float = 10000):
+    def __init__(self, initial_balance: float = 10000, bars_per_cycle: int = 1):
         self.balance = initial_balance
         self.initial_balance = initial_balance
         self.current_position = None
-        self.trades_history = []
         self.trade_count = 0
+        self.rng = np.random.default_rng()
+        
+        # Histórico de trades em colunas (SoA): campos numéricos em float64
+        # contíguos, crescendo por duplicação; texto em listas paralelas
+        self.n_trades = 0
+        self.pnls = np.empty(1024)
+        self.entry_prices = np.empty(1024)
+        self.exit_prices = np.empty(1024)
+        self.exit_times = np.empty(1024, dtype=np.int64)  # ms desde epoch
+        self.sides = []
+        self.reasons = []
+        
+        # Um único gerador mantém tendência e preço entre os ciclos
+        self.generator = DemoMarketDataGenerator()
+        self.bars_per_cycle = bars_per_cycle
+        self.history = self.generator.append(self.generator.window)
         
     async def get_market_data(self) -> Dict:
         """Simula obtenção de dados de mercado"""
-        generator = DemoMarketDataGenerator()
-        return generator.generate_realistic_data()
+        self.history = self.generator.append(self.bars_per_cycle)
+        return self.history
     
     async def get_orderbook(self) -> Dict:
-        """Simula book de ofertas"""
+        """Simula book de ofertas (formato colunar: preços e quantidades em float64)"""
         base_price = 50000
+        offsets = np.arange(5) * 10.0
+        quantities = self.rng.uniform(0.5, 2.0, 10)
         return {
-            'bids': [
-                [str(base_price - i * 10), str(random.uniform(0.5, 2.0))]
-                for i in range(5)
-            ],
-            'asks': [
-                [str(base_price + i * 10), str(random.uniform(0.5, 2.0))]
-                for i in range(5)
-            ]
+            'bids_price': base_price - offsets,
+            'bids_qty': quantities[:5],
+            'asks_price': base_price + offsets,
+            'asks_qty': quantities[5:]
         }
     
     async def get_account_balance(self) -> float:
@@ -114,15 +176,16 @@ class DemoExecutor:
         await asyncio.sleep(0.1)  # Simula latência
         
         # Simula preço de execução com pequeno slippage
-        fill_price = 50000 * random.uniform(0.9999, 1.0001)
+        fill_price = 50000 * self.rng.uniform(0.9999, 1.0001)
         
         # Cria posição
+        sl_key, tp_key = _SIDE_KEYS[action]
         self.current_position = {
             'side': action,
             'quantity': quantity,
             'entry_price': fill_price,
-            'stop_loss': risk_params['stop_loss_long' if action == 'BUY' else 'stop_loss_short'],
-            'take_profit': risk_params['take_profit_long' if action == 'BUY' else 'take_profit_short'],
+            'stop_loss': risk_params[sl_key],
+            'take_profit': risk_params[tp_key],
             'order_id': f"DEMO_{self.trade_count}",
             'timestamp': int(time.time() * 1000)
         }
@@ -153,7 +216,7 @@ class DemoExecutor:
             return {'success': False, 'error': 'Nenhuma posição para fechar'}
         
         # Simula preço de saída
-        exit_price = self.current_position['entry_price'] * random.uniform(0.99, 1.01)
+        exit_price = self.current_position['entry_price'] * self.rng.uniform(0.99, 1.01)
         
         # Calcula PnL
         entry_price = self.current_position['entry_price']
@@ -168,15 +231,7 @@ class DemoExecutor:
         self.balance += pnl
         
         # Salva histórico
-        trade_record = {
-            'entry_price': entry_price,
-            'exit_price': exit_price,
-            'pnl': pnl,
-            'side': self.current_position['side'],
-            'reason': reason,
-            'timestamp': datetime.now().isoformat()
-        }
-        self.trades_history.append(trade_record)
+        self._record_trade(entry_price, exit_price, pnl, self.current_position['side'], reason)
         
         # Limpa posição
         self.current_position = None
@@ -187,6 +242,39 @@ class DemoExecutor:
             'pnl': round(pnl, 2),
             'reason': reason
         }
+    
+    def _record_trade(self, entry_price: float, exit_price: float, pnl: float,
+                      side: str, reason: str):
+        """Acrescenta um trade às colunas do histórico"""
+        n = self.n_trades
+        if n == self.pnls.size:
+            self.pnls = np.resize(self.pnls, 2 * n)
+            self.entry_prices = np.resize(self.entry_prices, 2 * n)
+            self.exit_prices = np.resize(self.exit_prices, 2 * n)
+            self.exit_times = np.resize(self.exit_times, 2 * n)
+        
+        self.pnls[n] = pnl
+        self.entry_prices[n] = entry_price
+        self.exit_prices[n] = exit_price
+        self.exit_times[n] = int(time.time() * 1000)
+        self.sides.append(side)
+        self.reasons.append(reason)
+        self.n_trades = n + 1
+    
+    @property
+    def trades_history(self) -> List[Dict]:
+        """Histórico no formato antigo (lista de dicts), montado sob demanda"""
+        return [
+            {
+                'entry_price': float(self.entry_prices[i]),
+                'exit_price': float(self.exit_prices[i]),
+                'pnl': float(self.pnls[i]),
+                'side': self.sides[i],
+                'reason': self.reasons[i],
+                'timestamp': _format_ms(self.exit_times[i])
+            }
+            for i in range(self.n_trades)
+        ]
 
 
 class DemoTradingBot:
@@ -205,218 +293,248 @@ class DemoTradingBot:
         self.indicators = TechnicalIndicators(self.config['indicators'])
         self.strategy = TrendFollowingStrategy(self.config)
         self.risk_manager = AdaptiveRiskManager(self.config['risk_management'])
-        self.executor = DemoExecutor()
+        
+        # Um executor simulado por par; o par configurado é o principal
+        self.symbol = self.config['trading']['symbol']
+        self.executors = {self.symbol: DemoExecutor()}
+        self.executor = self.executors[self.symbol]
+        
+        # Estado incremental dos indicadores, um por par
+        self.symbol_indicators = {self.symbol: self.indicators}
         
         # Estado do bot
         self.is_running = False
-        self.current_position = None
         self.cycle_count = 0
+        self.verbose = True  # prints por trade/progresso; desligado no modo benchmark
         
         self.logger.info("🚀 Bot de Trading DEMO inicializado com sucesso")
     
-    async def start_demo(self, max_cycles: int = 50):
-        """Inicia demonstração do bot"""
+    async def start_demo(self, max_cycles: int = 50, benchmark: bool = False,
+                         symbols: List[str] | None = None):
+        """
+        Inicia demonstração do bot
+        benchmark=True remove o intervalo entre ciclos; symbols simula vários pares
+        em paralelo, cada um com seu próprio executor
+        """
         self.logger.info("🎯 Iniciando demonstração do bot de trading...")
         self.is_running = True
+        if benchmark:
+            self.verbose = False
+        
+        symbols = symbols or [self.symbol]
+        for symbol in symbols:
+            if symbol not in self.executors:
+                self.executors[symbol] = DemoExecutor()
+            if symbol not in self.symbol_indicators:
+                self.symbol_indicators[symbol] = TechnicalIndicators(self.config['indicators'])
         
         print("\n" + "="*60)
         print("🤖 BOT DE TRADING BINANCE - MODO DEMONSTRAÇÃO")
         print("="*60)
         print(f"💰 Saldo inicial: ${self.executor.initial_balance:,.2f}")
-        print(f"📊 Par de trading: {self.config['trading']['symbol']}")
+        print(f"📊 Par de trading: {', '.join(symbols)}")
         print(f"⚠️  Risco por trade: {self.config['trading']['risk_per_trade']*100:.1f}%")
         print("="*60)
         
         try:
             while self.is_running and self.cycle_count < max_cycles:
-                await self.run_trading_cycle()
+                # Erros de um par não interrompem os demais nem o loop
+                results = await asyncio.gather(
+                    *(self.run_trading_cycle(symbol) for symbol in symbols),
+                    return_exceptions=True
+                )
+                for symbol, result in zip(symbols, results):
+                    if isinstance(result, Exception):
+                        self.logger.error(f"❌ Erro no ciclo de trading ({symbol}): {result}")
                 self.cycle_count += 1
                 
                 # Mostra progresso
-                if self.cycle_count % 10 == 0:
+                if self.verbose and self.cycle_count % 10 == 0:
                     await self.show_progress()
                 
-                await asyncio.sleep(1)  # Simula intervalo entre análises
+                if not benchmark:
+                    await asyncio.sleep(1)  # Simula intervalo entre análises
                 
         except KeyboardInterrupt:
             self.logger.info("🛑 Demonstração interrompida pelo usuário")
         finally:
             await self.show_final_results()
     
-    async def run_trading_cycle(self):
-        """Executa um ciclo completo de trading"""
-        try:
-            # Obtém dados de mercado
-            market_data = await self.executor.get_market_data()
-            if not market_data:
-                return
-            
-            # Calcula indicadores técnicos
-            indicators_data = self.indicators.calculate_all(market_data)
-            current_price = market_data['close'][-1]
-            
-            # Verifica posição atual
-            self.current_position = await self.executor.get_current_position()
-            
-            if self.current_position:
-                # Gerencia posição existente
-                await self.manage_position(market_data, indicators_data, current_price)
-            else:
-                # Procura oportunidades de entrada
-                await self.evaluate_entry(market_data, indicators_data, current_price)
-                
-        except Exception as e:
-            self.logger.error(f"❌ Erro no ciclo de trading: {e}")
+    async def run_trading_cycle(self, symbol: str | None = None):
+        """Executa um ciclo completo de trading para um par"""
+        symbol = symbol or self.symbol
+        executor = self.executors[symbol]
+        # Obtém dados de mercado
+        market_data = await executor.get_market_data()
+        if not market_data:
+            return
+        
+        # Atualiza indicadores técnicos só com as barras novas
+        # (recalcula tudo no primeiro ciclo)
+        indicators_data = self.symbol_indicators[symbol].calculate_incremental(market_data)
+        current_price = market_data['close'][-1]
+        
+        # Verifica posição atual
+        position = await executor.get_current_position()
+        
+        if position:
+            # Gerencia posição existente
+            await self.manage_position(executor, position, market_data, indicators_data, current_price)
+        else:
+            # Procura oportunidades de entrada
+            await self.evaluate_entry(executor, market_data, indicators_data, current_price)
     
-    async def evaluate_entry(self, market_data: Dict, indicators_data: Dict, current_price: float):
+    async def evaluate_entry(self, executor: DemoExecutor, market_data: Dict,
+                             indicators_data: Dict, current_price: float):
         """Avalia oportunidades de entrada"""
-        try:
-            # Verifica sinais da estratégia
-            signal = self.strategy.get_entry_signal(market_data, indicators_data)
-            
-            if signal['action'] == 'NONE':
-                return
-            
-            # Valida pressão do book de ofertas
-            orderbook = await self.executor.get_orderbook()
-            if not orderbook or not self.strategy.validate_orderbook_pressure(orderbook, signal['action']):
-                self.logger.info(f"📖 Book de ofertas não confirma sinal {signal['action']}")
-                return
-            
-            # Calcula parâmetros de risco
-            account_balance = await self.executor.get_account_balance()
-            risk_params = self.risk_manager.calculate_position_size(
-                account_balance, current_price, indicators_data['atr']
-            )
-            
-            # Executa trade
-            trade_result = await self.executor.execute_trade(
-                signal['action'], risk_params['quantity'], risk_params
-            )
-            
-            if trade_result['success']:
+        # Verifica sinais da estratégia
+        signal = self.strategy.get_entry_signal(market_data, indicators_data)
+        
+        if signal['action'] == 'NONE':
+            return
+        
+        # Valida pressão do book de ofertas
+        orderbook = await executor.get_orderbook()
+        if not orderbook or not self.strategy.validate_orderbook_pressure(orderbook, signal['action']):
+            self.logger.info("📖 Book de ofertas não confirma sinal %s", signal['action'])
+            return
+        
+        # Calcula parâmetros de risco
+        account_balance = await executor.get_account_balance()
+        risk_params = self.risk_manager.calculate_position_size(
+            account_balance, current_price, indicators_data['atr']
+        )
+        
+        # Executa trade
+        trade_result = await executor.execute_trade(
+            signal['action'], risk_params['quantity'], risk_params
+        )
+        
+        if trade_result['success']:
+            sl_key, tp_key = _SIDE_KEYS[signal['action']]
+            if self.logger.isEnabledFor(logging.INFO):
                 self.logger.info(f"✅ Trade executado: {signal['action']} {risk_params['quantity']:.6f} a ${current_price:,.2f}")
-                print(f"\n🎯 NOVO TRADE: {signal['action']} a ${current_price:,.2f}")
-                print(f"📊 Confiança: {signal['confidence']*100:.1f}%")
-                print(f"💰 Quantidade: {risk_params['quantity']:.6f}")
-                print(f"🛡️  Stop Loss: ${risk_params['stop_loss_long' if signal['action'] == 'BUY' else 'stop_loss_short']:,.2f}")
-                print(f"🎯 Take Profit: ${risk_params['take_profit_long' if signal['action'] == 'BUY' else 'take_profit_short']:,.2f}")
-            
-        except Exception as e:
-            self.logger.error(f"❌ Erro ao avaliar entrada: {e}")
+            if self.verbose:
+                print("\n".join((
+                    f"\n🎯 NOVO TRADE: {signal['action']} a ${current_price:,.2f}",
+                    f"📊 Confiança: {signal['confidence']*100:.1f}%",
+                    f"💰 Quantidade: {risk_params['quantity']:.6f}",
+                    f"🛡️  Stop Loss: ${risk_params[sl_key]:,.2f}",
+                    f"🎯 Take Profit: ${risk_params[tp_key]:,.2f}"
+                )))
     
-    async def manage_position(self, market_data: Dict, indicators_data: Dict, current_price: float):
+    async def manage_position(self, executor: DemoExecutor, position: Dict, market_data: Dict,
+                              indicators_data: Dict, current_price: float):
         """Gerencia posição existente"""
-        try:
-            # Atualiza trailing stop se habilitado
-            if self.config['risk_management']['trailing_stop_enabled']:
-                new_stop = self.risk_manager.update_trailing_stop(
-                    self.current_position, current_price, indicators_data
-                )
-                
-                if new_stop != self.current_position['stop_loss']:
-                    await self.executor.update_stop_loss(new_stop)
-                    self.logger.info(f"📈 Trailing stop atualizado para ${new_stop:,.2f}")
-            
-            # Verifica condições de saída
-            exit_signal = self.strategy.get_exit_signal(
-                market_data, indicators_data, self.current_position
+        # Atualiza trailing stop se habilitado
+        if self.config['risk_management']['trailing_stop_enabled']:
+            new_stop = self.risk_manager.update_trailing_stop(
+                position, current_price, indicators_data
             )
             
-            # Simula hit de stop loss ou take profit
-            entry_price = self.current_position['entry_price']
-            stop_loss = self.current_position['stop_loss']
-            take_profit = self.current_position['take_profit']
-            
-            should_exit = False
-            exit_reason = ""
+            if new_stop != position['stop_loss']:
+                await executor.update_stop_loss(new_stop)
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(f"📈 Trailing stop atualizado para ${new_stop:,.2f}")
+        
+        # Verifica condições de saída
+        exit_signal = self.strategy.get_exit_signal(
+            market_data, indicators_data, position
+        )
+        
+        # Simula hit de stop loss ou take profit
+        stop_hit, target_hit = check_exits(
+            current_price, position['side'] == 'BUY',
+            position['stop_loss'], position['take_profit']
+        )
+        
+        should_exit = stop_hit or target_hit
+        exit_reason = ""
+        if stop_hit:
+            exit_reason = "Stop Loss atingido"
+        elif target_hit:
+            exit_reason = "Take Profit atingido"
+        
+        if should_exit or exit_signal['should_exit']:
+            if exit_signal['should_exit']:
+                exit_reason = exit_signal['reason']
             
-            if self.current_position['side'] == 'BUY':
-                if current_price <= stop_loss:
-                    should_exit = True
-                    exit_reason = "Stop Loss atingido"
-                elif current_price >= take_profit:
-                    should_exit = True
-                    exit_reason = "Take Profit atingido"
-            else:
-                if current_price >= stop_loss:
-                    should_exit = True
-                    exit_reason = "Stop Loss atingido"
-                elif current_price <= take_profit:
-                    should_exit = True
-                    exit_reason = "Take Profit atingido"
+            result = await executor.close_position(exit_reason)
             
-            if should_exit or exit_signal['should_exit']:
-                if exit_signal['should_exit']:
-                    exit_reason = exit_signal['reason']
-                
-                result = await self.executor.close_position(exit_reason)
+            if result['success']:
+                pnl = result['pnl']
+                pnl_pct = (pnl / executor.initial_balance) * 100
                 
-                if result['success']:
-                    pnl = result['pnl']
-                    pnl_pct = (pnl / self.executor.initial_balance) * 100
-                    
-                    emoji = "💚" if pnl > 0 else "❤️"
+                if self.logger.isEnabledFor(logging.INFO):
                     self.logger.info(f"🏁 Posição fechada: {exit_reason}, PnL: ${pnl:.2f}")
-                    print(f"\n{emoji} POSIÇÃO FECHADA")
-                    print(f"📝 Motivo: {exit_reason}")
-                    print(f"💰 PnL: ${pnl:,.2f} ({pnl_pct:+.2f}%)")
-                    print(f"💵 Saldo atual: ${self.executor.balance:,.2f}")
-                    
-        except Exception as e:
-            self.logger.error(f"❌ Erro ao gerenciar posição: {e}")
+                if self.verbose:
+                    emoji = "💚" if pnl > 0 else "❤️"
+                    print("\n".join((
+                        f"\n{emoji} POSIÇÃO FECHADA",
+                        f"📝 Motivo: {exit_reason}",
+                        f"💰 PnL: ${pnl:,.2f} ({pnl_pct:+.2f}%)",
+                        f"💵 Saldo atual: ${executor.balance:,.2f}"
+                    )))
     
     async def show_progress(self):
         """Mostra progresso da demonstração"""
-        balance = await self.executor.get_account_balance()
-        total_return = ((balance - self.executor.initial_balance) / self.executor.initial_balance) * 100
-        
         print(f"\n📊 Progresso (Ciclo {self.cycle_count})")
-        print(f"💰 Saldo: ${balance:,.2f} ({total_return:+.2f}%)")
-        print(f"📈 Trades realizados: {len(self.executor.trades_history)}")
+        for symbol, executor in self.executors.items():
+            balance = await executor.get_account_balance()
+            total_return = ((balance - executor.initial_balance) / executor.initial_balance) * 100
+            
+            if len(self.executors) > 1:
+                print(f"📊 Par de trading: {symbol}")
+            print(f"💰 Saldo: ${balance:,.2f} ({total_return:+.2f}%)")
+            print(f"📈 Trades realizados: {executor.n_trades}")
     
     async def show_final_results(self):
         """Mostra resultados finais da demonstração"""
-        balance = await self.executor.get_account_balance()
-        trades = self.executor.trades_history
-        
         print("\n" + "="*60)
         print("📊 RELATÓRIO FINAL DA DEMONSTRAÇÃO")
         print("="*60)
         
+        for symbol, executor in self.executors.items():
+            if len(self.executors) > 1:
+                print(f"📊 Par de trading: {symbol}")
+            await self._show_executor_results(executor)
+        
+        print("="*60)
+        print("✅ Demonstração concluída com sucesso!")
+        print("📝 Todas as funcionalidades do bot foram testadas")
+        print("🚀 O bot está pronto para trading real com chaves de API válidas")
+        print("="*60)
+    
+    async def _show_executor_results(self, executor: DemoExecutor):
+        """Mostra as estatísticas de um executor (par de trading)"""
+        balance = await executor.get_account_balance()
+        pnl = executor.pnls[:executor.n_trades]
+        
         # Estatísticas gerais
-        total_return = ((balance - self.executor.initial_balance) / self.executor.initial_balance) * 100
-        print(f"💰 Saldo inicial: ${self.executor.initial_balance:,.2f}")
+        total_return = ((balance - executor.initial_balance) / executor.initial_balance) * 100
+        print(f"💰 Saldo inicial: ${executor.initial_balance:,.2f}")
         print(f"💰 Saldo final: ${balance:,.2f}")
         print(f"📈 Retorno total: {total_return:+.2f}%")
-        print(f"📊 Total de trades: {len(trades)}")
+        print(f"📊 Total de trades: {pnl.size}")
         
-        if trades:
-            # Análise de trades
-            winning_trades = [t for t in trades if t['pnl'] > 0]
-            losing_trades = [t for t in trades if t['pnl'] < 0]
+        if pnl.size:
+            # Análise de trades direto sobre a coluna de PnL
+            wins = pnl[pnl > 0]
+            losses = pnl[pnl < 0]
             
-            win_rate = (len(winning_trades) / len(trades)) * 100
-            avg_win = sum(t['pnl'] for t in winning_trades) / len(winning_trades) if winning_trades else 0
-            avg_loss = sum(t['pnl'] for t in losing_trades) / len(losing_trades) if losing_trades else 0
+            win_rate = (wins.size / pnl.size) * 100
+            avg_win = wins.mean() if wins.size else 0
+            avg_loss = losses.mean() if losses.size else 0
             
             print(f"🎯 Taxa de acerto: {win_rate:.1f}%")
-            print(f"💚 Trades vencedores: {len(winning_trades)}")
-            print(f"❤️ Trades perdedores: {len(losing_trades)}")
+            print(f"💚 Trades vencedores: {wins.size}")
+            print(f"❤️ Trades perdedores: {losses.size}")
             print(f"📊 Ganho médio: ${avg_win:,.2f}")
             print(f"📊 Perda média: ${avg_loss:,.2f}")
             
-            best_trade = max(trades, key=lambda x: x['pnl'])
-            worst_trade = min(trades, key=lambda x: x['pnl'])
-            
-            print(f"🏆 Melhor trade: ${best_trade['pnl']:,.2f}")
-            print(f"💔 Pior trade: ${worst_trade['pnl']:,.2f}")
-        
-        print("="*60)
-        print("✅ Demonstração concluída com sucesso!")
-        print("📝 Todas as funcionalidades do bot foram testadas")
-        print("🚀 O bot está pronto para trading real com chaves de API válidas")
-        print("="*60)
+            best, worst = int(pnl.argmax()), int(pnl.argmin())
+            print(f"🏆 Melhor trade: ${pnl[best]:,.2f} ({_format_ms(executor.exit_times[best])})")
+            print(f"💔 Pior trade: ${pnl[worst]:,.2f} ({_format_ms(executor.exit_times[worst])})")
 
 
 async def main():
@@ -4,80 +4,404 @@ Handles all interactions with Binance API for trade execution and position manag
 """
 
 import os
+import hmac
 import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
-from binance.client import Client
-from binance.exceptions import BinanceAPIException
+import socket
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import quote
 import time
 
+import aiohttp
+import numpy as np
+from yarl import URL
+
+from _signing import sign_query
+from utils import RateLimiter, step_decimals
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is an optional dependency
+    from json import loads as json_loads
+
+
+BASE_URL = 'https://api.binance.com'
+TESTNET_URL = 'https://testnet.binance.vision'
+STREAM_URL = 'wss://stream.binance.com:9443/ws'
+TESTNET_STREAM_URL = 'wss://testnet.binance.vision/ws'
+
+KLINE_INTERVAL = '5m'
+
+# Keepalive probing for idle pooled connections (seconds)
+KEEPALIVE_IDLE = 5
+KEEPALIVE_INTERVAL = 2
+
+
+def _tuned_socket(addr_info) -> socket.socket:
+    """Socket factory for the HTTP connector: no Nagle delay, fast keepalive probes"""
+    family, type_, proto, _, _ = addr_info
+    sock = socket.socket(family=family, type=type_, proto=proto)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, 'TCP_KEEPIDLE'):  # Linux; other platforms keep OS defaults
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVAL)
+    return sock
+
+
+def create_connector(limit: int = 32) -> aiohttp.TCPConnector:
+    """IPv4-only connector: edge addresses resolved once and cached, warm tuned sockets"""
+    return aiohttp.TCPConnector(
+        limit=limit, use_dns_cache=True, ttl_dns_cache=600,
+        family=socket.AF_INET, socket_factory=_tuned_socket
+    )
+
+
+class BinanceAPIException(Exception):
+    """Error response returned by the Binance REST API"""
+    
+    def __init__(self, status: int, code: int, message: str):
+        super().__init__(f"APIError(code={code}): {message}")
+        self.status = status
+        self.code = code
+        self.message = message
+
 
 class BinanceExecutor:
     """Handles trade execution and position management on Binance"""
     
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize Binance client with API credentials"""
+    # Request weight of each REST endpoint used (Binance spot API)
+    WEIGHT_KLINES = 2
+    WEIGHT_ORDER_BOOK = 5
+    WEIGHT_ACCOUNT = 20
+    WEIGHT_OPEN_ORDERS = 6
+    WEIGHT_ORDER = 1
+    WEIGHT_EXCHANGE_INFO = 20
+    
+    def __init__(self, config: Dict[str, Any], session: Optional[aiohttp.ClientSession] = None):
+        """
+        Initialize executor with API credentials (call connect() before trading)
+        An injected session is shared and left open by aclose().
+        """
         self.config = config
         self.logger = logging.getLogger(__name__)
         
         # Get API credentials from environment variables
-        api_key = os.getenv('BINANCE_API_KEY', '')
-        secret_key = os.getenv('BINANCE_SECRET_KEY', '')
+        self._api_key = os.getenv('BINANCE_API_KEY', '')
+        self._secret_key = os.getenv('BINANCE_SECRET_KEY', '')
         
-        if not api_key or not secret_key:
+        if not self._api_key or not self._secret_key:
             raise ValueError("Binance API credentials not found in environment variables")
         
-        # Initialize Binance client
+        # Keyed HMAC state (inner/outer pads) computed once and copied per request
+        self._hmac_template = hmac.new(self._secret_key.encode(), digestmod=hashlib.sha256)
+        
+        # Sent per request so a shared session never leaks the key to other hosts
+        self._headers = {'X-MBX-APIKEY': self._api_key}
+        
+        testnet = config['api'].get('testnet', False)
+        self.base_url = TESTNET_URL if testnet else BASE_URL
+        self.stream_url = TESTNET_STREAM_URL if testnet else STREAM_URL
+        
+        # Persistent keep-alive session (own one created in connect() if none injected)
+        self._session = session
+        self._owns_session = session is None
+        
+        self.symbol = config['trading']['symbol']
+        
+        # Decimals of the symbol's tickSize/stepSize (None until load_symbol_filters)
+        self._price_decimals: Optional[int] = None
+        self._qty_decimals: Optional[int] = None
+        
+        # Signed query strings per endpoint: fixed fields pre-encoded, %-slots for
+        # the per-call values, timestamp always last (filled in by _signed)
+        symbol = quote(self.symbol)
+        self._templates = {
+            'account': 'timestamp=%d',
+            'open_orders': f'symbol={symbol}&timestamp=%d',
+            'order_market': f'symbol={symbol}&side=%s&type=MARKET&quantity=%s&timestamp=%d',
+            'order_stop_market': (f'symbol={symbol}&side=%s&type=STOP_MARKET&quantity=%s'
+                                  '&stopPrice=%s&timestamp=%d'),
+            'order_limit_gtc': (f'symbol={symbol}&side=%s&type=LIMIT&quantity=%s'
+                                '&price=%s&timeInForce=GTC&timestamp=%d'),
+            'order_cancel': f'symbol={symbol}&orderId=%d&timestamp=%d',
+        }
+        
+        # Token buckets: request weight per minute and orders per second
+        self.weight_limit = config['api'].get('weight_per_min', 1200)
+        self._weight_limiter = RateLimiter(self.weight_limit, 60)
+        self._order_limiter = RateLimiter(config['api'].get('orders_per_sec', 10), 1)
+        self._used_weight = 0
+        
+        # Rolling kline window fed by the WebSocket stream
+        # (timestamp, open, high, low, close, volume) per candle
+        self._klines = deque(maxlen=500)
+        self._stream_task: Optional[asyncio.Task] = None
+        self._candle_closed = asyncio.Event()
+        
+        # Open orders kept current by the user data stream (orderId -> order)
+        self._open_orders: Dict[int, Dict] = {}
+        self._user_stream_task: Optional[asyncio.Task] = None
+        
+        # Current position tracking
+        self.current_position = None
+        self.open_orders = []
+    
+    async def connect(self):
+        """Open the HTTP session and test connectivity"""
         try:
-            self.client = Client(
-                api_key=api_key,
-                api_secret=secret_key,
-                testnet=config['api'].get('testnet', False)
-            )
+            if self._owns_session and (self._session is None or self._session.closed):
+                self._session = aiohttp.ClientSession(connector=create_connector())
             
-            # Test connection
-            self.client.ping()
+            await self._request('GET', '/api/v3/ping')
             self.logger.info("Successfully connected to Binance API")
             
         except Exception as e:
             self.logger.error(f"Failed to connect to Binance API: {e}")
+            await self.aclose()
             raise
+    
+    async def aclose(self):
+        """Stop the streams and close the HTTP session"""
+        for task in (self._stream_task, self._user_stream_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._stream_task = None
+        self._user_stream_task = None
         
-        self.symbol = config['trading']['symbol']
-        self.rate_limit_delay = config['api']['rate_limit_delay']
+        if self._owns_session:
+            if self._session is not None and not self._session.closed:
+                await self._session.close()
+            self._session = None
+    
+    async def _request(self, method: str, path: str, params: Optional[Dict] = None,
+                       query: Optional[str] = None) -> Any:
+        """Send a REST request on the shared session and decode the JSON response"""
+        url = self.base_url + path
+        if query is not None:
+            # Pre-encoded (signed) query string must be sent byte for byte
+            url = URL(f"{url}?{query}", encoded=True)
         
-        # Current position tracking
-        self.current_position = None
-        self.open_orders = []
+        async with self._session.request(method, url, params=params, headers=self._headers) as response:
+            # Remember the weight Binance reports for the current minute
+            used = response.headers.get('x-mbx-used-weight-1m')
+            if used is not None:
+                self._used_weight = int(used)
+            
+            data = await response.json(content_type=None, loads=json_loads)
+            if response.status >= 400:
+                raise BinanceAPIException(response.status, data.get('code', 0), data.get('msg', ''))
+            return data
+    
+    async def _signed(self, method: str, path: str, template: str, *fields) -> Any:
+        """Send a request signed with HMAC-SHA256 of a templated query string"""
+        query = sign_query(self._hmac_template, self._templates[template], fields)
+        return await self._request(method, path, query=query)
+    
+    async def _throttle(self, weight: int, order: bool = False):
+        """Wait only when the weight (or order) budget is actually exhausted"""
+        if self._used_weight >= self.weight_limit:
+            # Binance resets the weight counter at the start of each minute
+            self.logger.warning(f"Request weight at {self._used_weight}, backing off until next minute")
+            await asyncio.sleep(60 - time.time() % 60)
+            self._used_weight = 0
+        
+        await self._weight_limiter.wait_if_needed(weight)
+        if order:
+            await self._order_limiter.wait_if_needed()
+    
+    async def start_kline_stream(self):
+        """Seed the kline window over REST once, then keep it updated from the WebSocket stream"""
+        await self._seed_klines()
+        self._stream_task = asyncio.create_task(self._run_kline_stream())
+        self.logger.info(f"Subscribed to {self.symbol} {KLINE_INTERVAL} kline stream")
+    
+    async def _seed_klines(self) -> int:
+        """Load the kline window over REST; returns how many candles opened after the stored ones"""
+        last_open = self._klines[-1][0] if self._klines else None
+        
+        await self._throttle(self.WEIGHT_KLINES)
+        klines = await self._fetch_klines(self._klines.maxlen)
+        
+        self._klines.clear()
+        self._klines.extend(
+            (int(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5]))
+            for k in klines
+        )
+        
+        if last_open is None:
+            return len(self._klines)
+        return sum(1 for candle in self._klines if candle[0] > last_open)
+    
+    async def _run_kline_stream(self):
+        """Consume kline events, reconnecting (and resyncing over REST) when the stream drops"""
+        url = f"{self.stream_url}/{self.symbol.lower()}@kline_{KLINE_INTERVAL}"
+        reconnecting = False
+        
+        while True:
+            try:
+                async with self._session.ws_connect(url, heartbeat=30) as ws:
+                    if reconnecting:
+                        # Candles may have closed while disconnected: refill the window
+                        # before applying events so the indicators never skip bars
+                        new_candles = await self._seed_klines()
+                        self.logger.warning(f"Kline stream resynced: {new_candles} candle(s) "
+                                            f"opened while disconnected")
+                        if new_candles:
+                            self._candle_closed.set()
+                        reconnecting = False
+                    
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            self._on_kline(json_loads(msg.data)['k'])
+                        elif msg.type == aiohttp.WSMsgType.ERROR:
+                            break
+                            
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Kline stream error: {e}")
+            
+            self.logger.warning("Kline stream disconnected, reconnecting...")
+            reconnecting = True
+            await asyncio.sleep(5)
+    
+    def _on_kline(self, k: Dict):
+        """Apply one kline event: update the forming candle or append a new one"""
+        candle = (int(k['t']), float(k['o']), float(k['h']), float(k['l']), float(k['c']), float(k['v']))
+        
+        last_open = self._klines[-1][0] if self._klines else -1
+        if candle[0] == last_open:
+            self._klines[-1] = candle
+        elif candle[0] > last_open:
+            self._klines.append(candle)
+        else:
+            return  # buffered before a REST resync that already holds a newer candle
+        
+        if k['x']:
+            self._candle_closed.set()
+    
+    async def wait_for_candle_close(self, timeout: float) -> bool:
+        """Wait until the stream reports a closed candle; False if timeout expires first"""
+        try:
+            await asyncio.wait_for(self._candle_closed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._candle_closed.clear()
+    
+    async def start_user_stream(self):
+        """Track open orders from the user data stream instead of polling openOrders"""
+        await self._seed_open_orders()
+        self._user_stream_task = asyncio.create_task(self._run_user_stream())
+        self.logger.info("Subscribed to user data stream")
+    
+    async def _seed_open_orders(self):
+        """Load the current open orders over REST"""
+        await self._throttle(self.WEIGHT_OPEN_ORDERS)
+        orders = await self._signed('GET', '/api/v3/openOrders', 'open_orders')
+        self._open_orders = {order['orderId']: order for order in orders}
+    
+    async def _run_user_stream(self):
+        """Consume executionReport events, keeping the listen key alive and reconnecting on drops"""
+        while True:
+            keepalive = None
+            try:
+                listen_key = (await self._request('POST', '/api/v3/userDataStream'))['listenKey']
+                keepalive = asyncio.create_task(self._keep_listen_key_alive(listen_key))
+                
+                async with self._session.ws_connect(f"{self.stream_url}/{listen_key}", heartbeat=30) as ws:
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            event = json_loads(msg.data)
+                            if event.get('e') == 'executionReport':
+                                self._on_execution_report(event)
+                        elif msg.type == aiohttp.WSMsgType.ERROR:
+                            break
+                            
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"User data stream error: {e}")
+            finally:
+                if keepalive is not None:
+                    keepalive.cancel()
+            
+            self.logger.warning("User data stream disconnected, reconnecting...")
+            await asyncio.sleep(5)
+            
+            # Events may have been missed while disconnected
+            try:
+                await self._seed_open_orders()
+            except Exception as e:
+                self.logger.error(f"Error reloading open orders: {e}")
+    
+    async def _keep_listen_key_alive(self, listen_key: str):
+        """Extend the listen key validity every 30 minutes"""
+        while True:
+            await asyncio.sleep(30 * 60)
+            try:
+                await self._request('PUT', '/api/v3/userDataStream', {'listenKey': listen_key})
+            except Exception as e:
+                self.logger.error(f"Error keeping listen key alive: {e}")
+    
+    def _on_execution_report(self, event: Dict):
+        """Apply one order update to the open orders cache"""
+        if event['s'] != self.symbol:
+            return
+        
+        if event['X'] in ('NEW', 'PARTIALLY_FILLED'):
+            self._open_orders[event['i']] = {
+                'orderId': event['i'],
+                'type': event['o'],
+                'side': event['S'],
+                'status': event['X']
+            }
+        else:
+            # FILLED, CANCELED, EXPIRED, REJECTED
+            self._open_orders.pop(event['i'], None)
+    
+    async def _get_open_orders(self) -> List[Dict]:
+        """Open orders from the stream cache, or over REST when not subscribed"""
+        if self._user_stream_task is not None:
+            return list(self._open_orders.values())
+        
+        await self._throttle(self.WEIGHT_OPEN_ORDERS)
+        return await self._signed('GET', '/api/v3/openOrders', 'open_orders')
+    
+    async def _fetch_klines(self, limit: int) -> List:
+        """Get raw kline rows over REST"""
+        return await self._request('GET', '/api/v3/klines', {
+            'symbol': self.symbol,
+            'interval': KLINE_INTERVAL,  # 5-minute candles
+            'limit': limit
+        })
     
     async def get_market_data(self, limit: int = 500) -> Optional[Dict]:
         """Get historical market data for analysis"""
         try:
+            # Served from the streamed window without any I/O when subscribed
+            if self._stream_task is not None and self._klines:
+                arr = np.array(self._klines, dtype=np.float64)[-limit:]
+                return self._to_columns(arr[:, 0].astype(np.int64), arr[:, 1:6])
+            
             # Add rate limiting
-            await asyncio.sleep(self.rate_limit_delay)
+            await self._throttle(self.WEIGHT_KLINES)
             
             # Get kline data (candlesticks)
-            klines = self.client.get_historical_klines(
-                self.symbol, 
-                Client.KLINE_INTERVAL_5MINUTE,  # 5-minute candles
-                limit=limit
-            )
+            klines = await self._fetch_klines(limit)
             
             if not klines:
                 self.logger.error("No market data received")
                 return None
             
-            # Convert to structured format
-            market_data = {
-                'timestamp': [int(k[0]) for k in klines],
-                'open': [float(k[1]) for k in klines],
-                'high': [float(k[2]) for k in klines],
-                'low': [float(k[3]) for k in klines],
-                'close': [float(k[4]) for k in klines],
-                'volume': [float(k[5]) for k in klines]
-            }
-            
-            return market_data
+            # Convert to structured format (numeric strings parsed by NumPy in one pass)
+            raw = np.array(klines, dtype=object)
+            return self._to_columns(raw[:, 0].astype(np.int64), raw[:, 1:6].astype(np.float64))
             
         except BinanceAPIException as e:
             self.logger.error(f"Binance API error getting market data: {e}")
@@ -86,17 +410,35 @@ class BinanceExecutor:
             self.logger.error(f"Error getting market data: {e}")
             return None
     
+    @staticmethod
+    def _to_columns(timestamps: np.ndarray, ohlcv: np.ndarray) -> Dict[str, np.ndarray]:
+        """Build the market data dict from int64 timestamps and an (n, 5) float64 OHLCV block"""
+        return {
+            'timestamp': timestamps,
+            'open': ohlcv[:, 0],
+            'high': ohlcv[:, 1],
+            'low': ohlcv[:, 2],
+            'close': ohlcv[:, 3],
+            'volume': ohlcv[:, 4]
+        }
+    
     async def get_orderbook(self, limit: int = 10) -> Optional[Dict]:
-        """Get current order book"""
+        """
+        Get current order book in columnar form
+        Returns {'bids_price', 'bids_qty', 'asks_price', 'asks_qty'} float64 arrays, best level first
+        """
         try:
-            await asyncio.sleep(self.rate_limit_delay)
+            await self._throttle(self.WEIGHT_ORDER_BOOK)
             
-            orderbook = self.client.get_order_book(symbol=self.symbol, limit=limit)
+            orderbook = await self._request('GET', '/api/v3/depth', {'symbol': self.symbol, 'limit': limit})
             
-            return {
-                'bids': orderbook['bids'],
-                'asks': orderbook['asks']
-            }
+            # One conversion of the [price, qty] string pairs per side
+            book = {}
+            for side in ('bids', 'asks'):
+                levels = np.array(orderbook[side], dtype=np.float64).reshape(-1, 2)
+                book[f'{side}_price'] = levels[:, 0]
+                book[f'{side}_qty'] = levels[:, 1]
+            return book
             
         except BinanceAPIException as e:
             self.logger.error(f"Binance API error getting orderbook: {e}")
@@ -105,12 +447,42 @@ class BinanceExecutor:
             self.logger.error(f"Error getting orderbook: {e}")
             return None
     
+    async def load_symbol_filters(self) -> Optional[Tuple[float, float]]:
+        """Fetch the symbol's (tickSize, stepSize) and format order fields to that grid"""
+        try:
+            await self._throttle(self.WEIGHT_EXCHANGE_INFO)
+            info = await self._request('GET', '/api/v3/exchangeInfo', params={'symbol': self.symbol})
+            filters = {f['filterType']: f for f in info['symbols'][0]['filters']}
+            tick_size = filters['PRICE_FILTER']['tickSize']
+            step_size = filters['LOT_SIZE']['stepSize']
+            
+            self._price_decimals = step_decimals(tick_size)
+            self._qty_decimals = step_decimals(step_size)
+            self.logger.info(f"Symbol filters: tickSize={tick_size}, stepSize={step_size}")
+            return float(tick_size), float(step_size)
+            
+        except Exception as e:
+            self.logger.error(f"Error loading symbol filters: {e}")
+            return None
+    
+    def _price_field(self, price: float):
+        """Price as sent to the exchange (fixed tick decimals once filters are loaded)"""
+        if self._price_decimals is None:
+            return price
+        return f"{price:.{self._price_decimals}f}"
+    
+    def _qty_field(self, quantity: float):
+        """Quantity as sent to the exchange (fixed step decimals once filters are loaded)"""
+        if self._qty_decimals is None:
+            return quantity
+        return f"{quantity:.{self._qty_decimals}f}"
+    
     async def get_account_balance(self) -> float:
         """Get current account balance in USDT"""
         try:
-            await asyncio.sleep(self.rate_limit_delay)
+            await self._throttle(self.WEIGHT_ACCOUNT)
             
-            account = self.client.get_account()
+            account = await self._signed('GET', '/api/v3/account', 'account')
             
             # Find USDT balance
             for balance in account['balances']:
@@ -129,17 +501,14 @@ class BinanceExecutor:
     async def execute_trade(self, action: str, quantity: float, risk_params: Dict) -> Dict[str, Any]:
         """Execute a market order"""
         try:
-            await asyncio.sleep(self.rate_limit_delay)
+            await self._throttle(self.WEIGHT_ORDER, order=True)
             
             # Determine order side
-            side = Client.SIDE_BUY if action == 'BUY' else Client.SIDE_SELL
+            side = 'BUY' if action == 'BUY' else 'SELL'
             
             # Place market order
-            order = self.client.order_market(
-                symbol=self.symbol,
-                side=side,
-                quantity=quantity
-            )
+            order = await self._signed('POST', '/api/v3/order', 'order_market', side,
+                                        self._qty_field(quantity))
             
             if order['status'] == 'FILLED':
                 # Calculate actual fill price
@@ -153,11 +522,11 @@ class BinanceExecutor:
                     stop_loss = risk_params['stop_loss_short']
                     take_profit = risk_params['take_profit_short']
                 
-                # Place stop loss order
-                await self._place_stop_loss_order(action, quantity, stop_loss)
-                
-                # Place take profit order
-                await self._place_take_profit_order(action, quantity, take_profit)
+                # Place stop loss and take profit orders concurrently
+                await asyncio.gather(
+                    self._place_stop_loss_order(action, quantity, stop_loss),
+                    self._place_take_profit_order(action, quantity, take_profit)
+                )
                 
                 # Update position tracking
                 self.current_position = {
@@ -192,19 +561,15 @@ class BinanceExecutor:
     async def _place_stop_loss_order(self, position_side: str, quantity: float, stop_price: float):
         """Place stop loss order"""
         try:
-            await asyncio.sleep(self.rate_limit_delay)
+            await self._throttle(self.WEIGHT_ORDER, order=True)
             
             # Determine order side (opposite of position)
-            order_side = Client.SIDE_SELL if position_side == 'BUY' else Client.SIDE_BUY
+            order_side = 'SELL' if position_side == 'BUY' else 'BUY'
             
             # Place stop loss order
-            stop_order = self.client.create_order(
-                symbol=self.symbol,
-                side=order_side,
-                type="STOP_MARKET",
-                quantity=quantity,
-                stopPrice=stop_price
-            )
+            stop_order = await self._signed('POST', '/api/v3/order', 'order_stop_market',
+                                            order_side, self._qty_field(quantity),
+                                            self._price_field(stop_price))
             
             self.logger.info(f"Stop loss placed at {stop_price}")
             return stop_order
@@ -216,20 +581,15 @@ class BinanceExecutor:
     async def _place_take_profit_order(self, position_side: str, quantity: float, target_price: float):
         """Place take profit order"""
         try:
-            await asyncio.sleep(self.rate_limit_delay)
+            await self._throttle(self.WEIGHT_ORDER, order=True)
             
             # Determine order side (opposite of position)
-            order_side = Client.SIDE_SELL if position_side == 'BUY' else Client.SIDE_BUY
+            order_side = 'SELL' if position_side == 'BUY' else 'BUY'
             
             # Place limit order at target price
-            tp_order = self.client.create_order(
-                symbol=self.symbol,
-                side=order_side,
-                type=Client.ORDER_TYPE_LIMIT,
-                quantity=quantity,
-                price=target_price,
-                timeInForce=Client.TIME_IN_FORCE_GTC
-            )
+            tp_order = await self._signed('POST', '/api/v3/order', 'order_limit_gtc',
+                                          order_side, self._qty_field(quantity),
+                                          self._price_field(target_price))
             
             self.logger.info(f"Take profit placed at {target_price}")
             return tp_order
@@ -238,14 +598,16 @@ class BinanceExecutor:
             self.logger.error(f"Error placing take profit: {e}")
             return None
     
+    async def _cancel_order(self, order_id: int):
+        """Cancel one open order"""
+        await self._throttle(self.WEIGHT_ORDER)
+        return await self._signed('DELETE', '/api/v3/order', 'order_cancel', order_id)
+    
     async def get_current_position(self) -> Optional[Dict]:
         """Get current position information"""
         try:
-            # For spot trading, check current balance and open orders
-            await asyncio.sleep(self.rate_limit_delay)
-            
-            # Check if we have any open orders that indicate a position
-            open_orders = self.client.get_open_orders(symbol=self.symbol)
+            # For spot trading, check if we have any open orders that indicate a position
+            open_orders = await self._get_open_orders()
             
             if open_orders and self.current_position:
                 return self.current_position
@@ -263,20 +625,29 @@ class BinanceExecutor:
             if not self.current_position:
                 return False
             
-            await asyncio.sleep(self.rate_limit_delay)
-            
-            # Cancel existing stop loss orders
-            open_orders = self.client.get_open_orders(symbol=self.symbol)
-            for order in open_orders:
-                if order['type'] == 'STOP_MARKET':
-                    self.client.cancel_order(symbol=self.symbol, orderId=order['orderId'])
+            # Existing stop loss orders, listed before the new one exists
+            open_orders = await self._get_open_orders()
+            old_stops = [order['orderId'] for order in open_orders if order['type'] == 'STOP_MARKET']
             
-            # Place new stop loss
-            await self._place_stop_loss_order(
+            # Place the new stop first: if it is rejected the old one stays in force
+            stop_order = await self._place_stop_loss_order(
                 self.current_position['side'],
                 self.current_position['quantity'],
                 new_stop_price
             )
+            if not stop_order:
+                self.logger.error(f"New stop loss at {new_stop_price} rejected, "
+                                  f"keeping stop at {self.current_position['stop_loss']}")
+                return False
+            
+            # Then cancel the old stops concurrently
+            results = await asyncio.gather(
+                *(self._cancel_order(order_id) for order_id in old_stops),
+                return_exceptions=True
+            )
+            for order_id, result in zip(old_stops, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Error cancelling old stop loss {order_id}: {result}")
             
             # Update position
             self.current_position['stop_loss'] = new_stop_price
@@ -293,21 +664,20 @@ class BinanceExecutor:
             if not self.current_position:
                 return {'success': False, 'error': 'No position to close'}
             
-            await asyncio.sleep(self.rate_limit_delay)
-            
-            # Cancel all open orders for this symbol
-            open_orders = self.client.get_open_orders(symbol=self.symbol)
-            for order in open_orders:
-                self.client.cancel_order(symbol=self.symbol, orderId=order['orderId'])
+            # Cancel all open orders for this symbol concurrently
+            open_orders = await self._get_open_orders()
+            await asyncio.gather(
+                *(self._cancel_order(order['orderId']) for order in open_orders),
+                return_exceptions=True
+            )
             
             # Place market order to close position
-            close_side = Client.SIDE_SELL if self.current_position['side'] == 'BUY' else Client.SIDE_BUY
+            close_side = 'SELL' if self.current_position['side'] == 'BUY' else 'BUY'
             
-            close_order = self.client.order_market(
-                symbol=self.symbol,
-                side=close_side,
-                quantity=self.current_position['quantity']
-            )
+            await self._throttle(self.WEIGHT_ORDER, order=True)
+            close_order = await self._signed('POST', '/api/v3/order', 'order_market',
+                                             close_side,
+                                             self._qty_field(self.current_position['quantity']))
             
             if close_order['status'] == 'FILLED':
                 exit_price = float(close_order['fills'][0]['price']) if close_order['fills'] else 0
@@ -3,136 +3,225 @@ Technical Indicators Module
 Implements all technical analysis indicators used by the trading strategy
 """
 
-import pandas as pd
 import numpy as np
-import ta
-from typing import Dict, List, Any
+from bisect import bisect_right
+from typing import Dict, Any
 import logging
 
+from _kernels import (
+    compute_indicators, indicator_series, new_state, run_bars, smoothing_params,
+    state_values, step, INDICATOR_NAMES
+)
+
+
+# Condition bits packed by TechnicalIndicators.signal_mask
+TREND_BULL = 1 << 0      # price above EMA 200
+TREND_BEAR = 1 << 1      # price below EMA 200
+MACD_BULL = 1 << 2       # MACD histogram positive
+MACD_BEAR = 1 << 3       # MACD histogram negative
+RSI_OVERSOLD = 1 << 4    # RSI below 30
+RSI_OVERBOUGHT = 1 << 5  # RSI above 70
+VOL_CONF = 1 << 6        # volume ratio above volume_multiplier
+ADX_TREND = 1 << 7       # ADX at least 25 (trend strength not WEAK)
+
+# ADX bucket edges and their trend strength labels
+_ADX_THRESHOLDS = (25, 50)
+_ADX_LABELS = ("WEAK", "MODERATE", "STRONG")
+
 
 class TechnicalIndicators:
     """Class for calculating technical indicators"""
     
+    __slots__ = ('config', 'logger', '_vol_mult', '_periods', '_step_params',
+                 '_value_params', '_state', '_ring', '_last_ts')
+    
     def __init__(self, config: Dict[str, Any]):
         """Initialize with indicator configuration"""
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self._vol_mult = config['volume_multiplier']
+        
+        # Periods and smoothing factors resolved once, in kernel argument order
+        self._periods = (
+            config['ema_period'], config['macd_fast'], config['macd_slow'],
+            config['macd_signal'], config['rsi_period'], config['atr_period'],
+            config.get('adx_period', 14), config['volume_period']
+        )
+        ema_p, _, macd_s, macd_sig, rsi_p, atr_p, _, vol_p = self._periods
+        self._step_params = smoothing_params(*self._periods)
+        self._value_params = (ema_p, macd_s, macd_sig, rsi_p, atr_p, vol_p)
+        
+        # Streaming state for incremental updates (None until warmed up)
+        self._state = None
+        self._ring = None
+        self._last_ts = None
     
     def calculate_all(self, market_data: Dict) -> Dict[str, Any]:
-        """Calculate all required technical indicators"""
+        """Calculate all required technical indicators (single fused pass)"""
         try:
-            df = pd.DataFrame(market_data)
-            
-            indicators = {}
+            high, low, close, volume = self._columns(market_data)
+            values = compute_indicators(high, low, close, volume, *self._periods)
+            return dict(zip(INDICATOR_NAMES, values))
             
-            # Exponential Moving Average
-            indicators['ema_200'] = self.calculate_ema(df['close'], self.config['ema_period'])
-            
-            # MACD
-            macd_data = self.calculate_macd(
-                df['close'],
-                self.config['macd_fast'],
-                self.config['macd_slow'],
-                self.config['macd_signal']
-            )
-            indicators.update(macd_data)
+        except Exception as e:
+            self.logger.error(f"Error calculating indicators: {e}")
+            return {}
+    
+    def calculate_series(self, market_data: Dict) -> Dict[str, np.ndarray]:
+        """
+        Indicator values after every bar, one array per indicator (backtests)
+        Element i equals calculate_all over the first i + 1 bars.
+        """
+        high, low, close, volume = self._columns(market_data)
+        values = indicator_series(high, low, close, volume, *self._periods)
+        return {name: values[:, i] for i, name in enumerate(INDICATOR_NAMES)}
+    
+    def calculate_incremental(self, market_data: Dict, last_bar_open: bool = False) -> Dict[str, Any]:
+        """
+        Update indicators with only the bars not seen yet
+        Replays the full history on cold start or when the last seen bar left the window.
+        With last_bar_open the final (still forming) candle is included in the
+        result but not committed to the state, so it is re-evaluated next tick.
+        """
+        try:
+            timestamps = market_data['timestamp']
+            n_closed = len(timestamps) - 1 if last_bar_open else len(timestamps)
             
-            # RSI
-            indicators['rsi'] = self.calculate_rsi(df['close'], self.config['rsi_period'])
+            # One float64 view per column (no copy when already float64 arrays)
+            columns = self._columns(market_data)
             
-            # ATR (Average True Range)
-            indicators['atr'] = self.calculate_atr(
-                df['high'], df['low'], df['close'], self.config['atr_period']
-            )
+            start = 0
+            if self._state is not None:
+                start = int(np.searchsorted(timestamps, self._last_ts, side='right'))
             
-            # Volume analysis
-            indicators['volume_ma'] = self.calculate_volume_ma(df['volume'], self.config['volume_period'])
-            indicators['volume_ratio'] = df['volume'].iloc[-1] / indicators['volume_ma'].iloc[-1]
+            if start == 0:
+                self._reset_state()
             
-            # ADX for trend strength
-            indicators['adx'] = self.calculate_adx(
-                df['high'], df['low'], df['close'], self.config.get('adx_period', 14)
-            )
+            if start < n_closed:
+                self._advance(columns, start, n_closed)
+                self._last_ts = timestamps[n_closed - 1]
             
-            # Current values (most recent)
-            current_indicators = {
-                'ema_200': indicators['ema_200'].iloc[-1],
-                'macd': indicators['macd'].iloc[-1],
-                'macd_signal': indicators['macd_signal'].iloc[-1],
-                'macd_histogram': indicators['macd_histogram'].iloc[-1],
-                'rsi': indicators['rsi'].iloc[-1],
-                'atr': indicators['atr'].iloc[-1],
-                'volume_ratio': indicators['volume_ratio'],
-                'adx': indicators['adx'].iloc[-1]
-            }
+            if not last_bar_open:
+                return self.snapshot()
             
-            return current_indicators
+            # Preview the forming candle on a copy of the state
+            state, ring = self._state.copy(), self._ring.copy()
+            high, low, close, volume = columns
+            self._step(state, ring, high[-1], low[-1], close[-1], volume[-1])
+            return self._values(state)
             
         except Exception as e:
-            self.logger.error(f"Error calculating indicators: {e}")
+            self.logger.error(f"Error updating indicators: {e}")
             return {}
     
-    def calculate_ema(self, prices: pd.Series, period: int) -> pd.Series:
-        """Calculate Exponential Moving Average"""
-        return ta.trend.ema_indicator(close=prices, window=period)
-    
-    def calculate_macd(self, prices: pd.Series, fast: int, slow: int, signal: int) -> Dict[str, pd.Series]:
-        """Calculate MACD indicator"""
-        return {
-            'macd': ta.trend.macd(close=prices, window_fast=fast, window_slow=slow),
-            'macd_signal': ta.trend.macd_signal(close=prices, window_fast=fast, window_slow=slow, window_sign=signal),
-            'macd_histogram': ta.trend.macd_diff(close=prices, window_fast=fast, window_slow=slow, window_sign=signal)
-        }
-    
-    def calculate_rsi(self, prices: pd.Series, period: int) -> pd.Series:
-        """Calculate Relative Strength Index"""
-        return ta.momentum.rsi(close=prices, window=period)
-    
-    def calculate_atr(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int) -> pd.Series:
-        """Calculate Average True Range"""
-        return ta.volatility.average_true_range(high=high, low=low, close=close, window=period)
-    
-    def calculate_volume_ma(self, volume: pd.Series, period: int) -> pd.Series:
-        """Calculate Volume Moving Average"""
-        return volume.rolling(window=period).mean()
-    
-    def calculate_adx(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int) -> pd.Series:
-        """Calculate Average Directional Index"""
-        return ta.trend.adx(high=high, low=low, close=close, window=period)
-    
-    def is_trend_bullish(self, price: float, ema_200: float) -> bool:
+    def warm_up(self, market_data: Dict) -> Dict[str, Any]:
+        """Seed the streaming state by replaying the full history"""
+        self._reset_state()
+        n = len(market_data['close'])
+        self._advance(self._columns(market_data), 0, n)
+        self._last_ts = market_data['timestamp'][n - 1]
+        return self.snapshot()
+    
+    def update(self, new_bar: Dict[str, float]) -> Dict[str, Any]:
+        """Advance the streaming state by one closed bar in O(1)"""
+        if self._state is None:
+            self._reset_state()
+        self._step(
+            self._state, self._ring,
+            new_bar['high'], new_bar['low'], new_bar['close'], new_bar['volume']
+        )
+        self._last_ts = new_bar.get('timestamp')
+        return self.snapshot()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current indicator values from the streaming state"""
+        if self._state is None:
+            return {}
+        return self._values(self._state)
+    
+    def _reset_state(self):
+        """Reset the streaming state"""
+        self._state, self._ring = new_state(self._periods[-1])
+        self._last_ts = None
+    
+    def _advance(self, columns: tuple, start: int, stop: int):
+        """Step the streaming state through bars [start, stop) of _columns() output"""
+        high, low, close, volume = columns
+        run_bars(
+            self._state, self._ring,
+            high[start:stop], low[start:stop], close[start:stop], volume[start:stop],
+            *self._step_params
+        )
+    
+    def _step(self, state: np.ndarray, ring: np.ndarray,
+              high: float, low: float, close: float, volume: float):
+        """Advance a state vector by one bar"""
+        step(state, ring, float(high), float(low), float(close), float(volume), *self._step_params)
+    
+    def _values(self, state: np.ndarray) -> Dict[str, Any]:
+        """Indicator values of a state vector"""
+        return dict(zip(INDICATOR_NAMES, state_values(state, *self._value_params)))
+    
+    @staticmethod
+    def _columns(market_data: Dict):
+        """high, low, close, volume as float64 arrays"""
+        return tuple(
+            np.asarray(market_data[col], dtype=np.float64)
+            for col in ('high', 'low', 'close', 'volume')
+        )
+    
+    def signal_mask(self, ind: Dict[str, Any], price: float) -> int:
+        """
+        Pack every predicate below into one 8-bit mask (see the module-level bits)
+        Test conditions with e.g. mask & TREND_BULL and mask & MACD_BULL.
+        """
+        ema_200 = ind['ema_200']
+        macd_histogram = ind['macd_histogram']
+        rsi = ind['rsi']
+        return ((price > ema_200)
+                | (price < ema_200) << 1
+                | (macd_histogram > 0) << 2
+                | (macd_histogram < 0) << 3
+                | (rsi < 30) << 4
+                | (rsi > 70) << 5
+                | (ind['volume_ratio'] > self._vol_mult) << 6
+                | (ind['adx'] >= 25) << 7)
+    
+    @staticmethod
+    def is_trend_bullish(price: float, ema_200: float) -> bool:
         """Check if trend is bullish based on EMA 200"""
         return price > ema_200
     
-    def is_trend_bearish(self, price: float, ema_200: float) -> bool:
+    @staticmethod
+    def is_trend_bearish(price: float, ema_200: float) -> bool:
         """Check if trend is bearish based on EMA 200"""
         return price < ema_200
     
-    def is_macd_bullish(self, macd_histogram: float) -> bool:
+    @staticmethod
+    def is_macd_bullish(macd_histogram: float) -> bool:
         """Check if MACD shows bullish momentum"""
         return macd_histogram > 0
     
-    def is_macd_bearish(self, macd_histogram: float) -> bool:
+    @staticmethod
+    def is_macd_bearish(macd_histogram: float) -> bool:
         """Check if MACD shows bearish momentum"""
         return macd_histogram < 0
     
-    def is_rsi_oversold(self, rsi: float, threshold: float = 30) -> bool:
+    @staticmethod
+    def is_rsi_oversold(rsi: float, threshold: float = 30) -> bool:
         """Check if RSI indicates oversold conditions"""
         return rsi < threshold
     
-    def is_rsi_overbought(self, rsi: float, threshold: float = 70) -> bool:
+    @staticmethod
+    def is_rsi_overbought(rsi: float, threshold: float = 70) -> bool:
         """Check if RSI indicates overbought conditions"""
         return rsi > threshold
     
     def has_volume_confirmation(self, volume_ratio: float) -> bool:
         """Check if volume confirms the move"""
-        return volume_ratio > self.config['volume_multiplier']
-    
-    def get_trend_strength(self, adx: float) -> str:
-        """Determine trend strength based on ADX"""
-        if adx < 25:
-            return "WEAK"
-        elif adx < 50:
-            return "MODERATE"
-        else:
-            return "STRONG"
+        return volume_ratio > self._vol_mult
+    
+    @staticmethod
+    def get_trend_strength(adx: float) -> str:
+        """Determine trend strength based on ADX (WEAK < 25 <= MODERATE < 50 <= STRONG)"""
+        return _ADX_LABELS[bisect_right(_ADX_THRESHOLDS, adx)]
@@ -3,14 +3,27 @@ Logging Configuration Module
 Sets up comprehensive logging for the trading bot
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
-from typing import Dict, Any
+import queue
+from typing import Dict, Any, List, Optional
+
+
+# Background thread doing the blocking handler I/O (started by setup_logging)
+_listener: Optional[logging.handlers.QueueListener] = None
 
 
 def setup_logging(config: Dict[str, Any]):
     """Setup logging configuration for the trading bot"""
+    global _listener
+    
+    # Resolve the level name up front so a typo fails before anything is set up
+    log_level = config.get('level', 'INFO')
+    level = getattr(logging, str(log_level).upper(), None)
+    if not isinstance(level, int):
+        raise ValueError(f"Invalid log level: {log_level!r}")
     
     # Create logs directory if it doesn't exist
     log_dir = "logs"
@@ -18,7 +31,6 @@ def setup_logging(config: Dict[str, Any]):
         os.makedirs(log_dir)
     
     # Get configuration
-    log_level = config.get('level', 'INFO')
     log_file = os.path.join(log_dir, config.get('file', 'trading_bot.log'))
     max_file_size = config.get('max_file_size', 10485760)  # 10MB
     backup_count = config.get('backup_count', 5)
@@ -31,17 +43,17 @@ def setup_logging(config: Dict[str, Any]):
     
     # Configure root logger
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, log_level.upper()))
+    root_logger.setLevel(level)
     
     # Remove existing handlers
+    stop_logging()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
     # Console handler
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, log_level.upper()))
+    console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
     
     # File handler with rotation
     file_handler = logging.handlers.RotatingFileHandler(
@@ -49,95 +61,117 @@ def setup_logging(config: Dict[str, Any]):
         maxBytes=max_file_size,
         backupCount=backup_count
     )
-    file_handler.setLevel(getattr(logging, log_level.upper()))
+    file_handler.setLevel(level)
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
     
     # Create separate loggers for different components
-    setup_component_loggers(formatter)
+    handlers = [console_handler, file_handler, *setup_component_loggers(formatter)]
+    
+    # Loggers only enqueue records; the listener thread formats and writes them
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
     
     logging.info("Logging system initialized")
 
 
-def setup_component_loggers(formatter):
-    """Setup specialized loggers for different components"""
+def stop_logging():
+    """Flush queued records and stop the background listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def _component_handler(name: str, path: str, formatter: logging.Formatter) -> logging.Handler:
+    """File handler that only accepts records from the named component logger"""
+    handler = logging.FileHandler(path)
+    handler.setFormatter(formatter)
+    handler.addFilter(logging.Filter(name))
+    return handler
+
+
+def setup_component_loggers(formatter) -> List[logging.Handler]:
+    """
+    Setup specialized loggers for different components
+    Returns their file handlers, which run behind the queue listener; records
+    reach them by propagating to the root logger's queue handler.
+    """
     
     # Trading decisions logger
-    trading_logger = logging.getLogger('trading_decisions')
-    trading_handler = logging.FileHandler('logs/trading_decisions.log')
-    trading_handler.setFormatter(formatter)
-    trading_logger.addHandler(trading_handler)
-    trading_logger.setLevel(logging.INFO)
+    logging.getLogger('trading_decisions').setLevel(logging.INFO)
     
     # API communication logger
-    api_logger = logging.getLogger('api_communication')
-    api_handler = logging.FileHandler('logs/api_communication.log')
-    api_handler.setFormatter(formatter)
-    api_logger.addHandler(api_handler)
-    api_logger.setLevel(logging.DEBUG)
+    logging.getLogger('api_communication').setLevel(logging.DEBUG)
     
     # Risk management logger
-    risk_logger = logging.getLogger('risk_management')
-    risk_handler = logging.FileHandler('logs/risk_management.log')
-    risk_handler.setFormatter(formatter)
-    risk_logger.addHandler(risk_handler)
-    risk_logger.setLevel(logging.INFO)
+    logging.getLogger('risk_management').setLevel(logging.INFO)
     
     # Performance logger
-    performance_logger = logging.getLogger('performance')
-    performance_handler = logging.FileHandler('logs/performance.log')
+    logging.getLogger('performance').setLevel(logging.INFO)
     performance_formatter = logging.Formatter(
         '%(asctime)s,%(message)s',  # CSV format for analysis
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    performance_handler.setFormatter(performance_formatter)
-    performance_logger.addHandler(performance_handler)
-    performance_logger.setLevel(logging.INFO)
+    
+    return [
+        _component_handler('trading_decisions', 'logs/trading_decisions.log', formatter),
+        _component_handler('api_communication', 'logs/api_communication.log', formatter),
+        _component_handler('risk_management', 'logs/risk_management.log', formatter),
+        _component_handler('performance', 'logs/performance.log', performance_formatter)
+    ]
 
 
 class TradingLogger:
     """Specialized logger for trading operations"""
     
-    def __init__(self):
-        self.trading_logger = logging.getLogger('trading_decisions')
-        self.api_logger = logging.getLogger('api_communication')
-        self.risk_logger = logging.getLogger('risk_management')
-        self.performance_logger = logging.getLogger('performance')
+    # Component loggers resolved once (getLogger returns the same objects anyway)
+    trading_logger = logging.getLogger('trading_decisions')
+    api_logger = logging.getLogger('api_communication')
+    risk_logger = logging.getLogger('risk_management')
+    performance_logger = logging.getLogger('performance')
     
     def log_signal(self, signal_type: str, action: str, price: float, confidence: float, reasons: list):
         """Log trading signal details"""
-        message = f"SIGNAL: {signal_type} | Action: {action} | Price: {price} | Confidence: {confidence:.2f} | Reasons: {', '.join(reasons)}"
-        self.trading_logger.info(message)
+        if self.trading_logger.isEnabledFor(logging.INFO):
+            self.trading_logger.info(
+                "SIGNAL: %s | Action: %s | Price: %s | Confidence: %.2f | Reasons: %s",
+                signal_type, action, price, confidence, ', '.join(reasons)
+            )
     
     def log_trade_execution(self, action: str, quantity: float, price: float, order_id: str):
         """Log trade execution details"""
-        message = f"TRADE: {action} | Quantity: {quantity} | Price: {price} | OrderID: {order_id}"
-        self.trading_logger.info(message)
+        self.trading_logger.info("TRADE: %s | Quantity: %s | Price: %s | OrderID: %s",
+                                 action, quantity, price, order_id)
     
     def log_position_update(self, position_type: str, details: dict):
         """Log position updates"""
-        message = f"POSITION: {position_type} | Details: {details}"
-        self.trading_logger.info(message)
+        self.trading_logger.info("POSITION: %s | Details: %s", position_type, details)
     
     def log_risk_calculation(self, risk_type: str, calculations: dict):
         """Log risk management calculations"""
-        message = f"RISK: {risk_type} | Calculations: {calculations}"
-        self.risk_logger.info(message)
+        self.risk_logger.info("RISK: %s | Calculations: %s", risk_type, calculations)
     
     def log_api_call(self, endpoint: str, params: dict, response_status: str):
         """Log API call details"""
-        message = f"API: {endpoint} | Params: {params} | Status: {response_status}"
-        self.api_logger.debug(message)
+        if self.api_logger.isEnabledFor(logging.DEBUG):
+            self.api_logger.debug("API: %s | Params: %s | Status: %s", endpoint, params, response_status)
     
     def log_performance(self, trade_id: str, entry_price: float, exit_price: float, 
                        pnl: float, duration: int, reason: str):
         """Log performance data in CSV format"""
-        message = f"{trade_id},{entry_price},{exit_price},{pnl},{duration},{reason}"
-        self.performance_logger.info(message)
+        self.performance_logger.info("%s,%s,%s,%s,%s,%s",
+                                     trade_id, entry_price, exit_price, pnl, duration, reason)
     
     def log_error(self, component: str, error_message: str, error_details: str = ""):
         """Log error details"""
-        message = f"ERROR: {component} | Message: {error_message}"
         if error_details:
-            message += f" | Details: {error_details}"
-        logging.error(message)
+            logging.error("ERROR: %s | Message: %s | Details: %s", component, error_message, error_details)
+        else:
+            logging.error("ERROR: %s | Message: %s", component, error_message)
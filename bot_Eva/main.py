@@ -9,17 +9,26 @@ import time
 import asyncio
 import logging
 import yaml
+import aiohttp
 from datetime import datetime
 from typing import Dict, Any
 
 from indicators import TechnicalIndicators
 from strategy import TrendFollowingStrategy
 from risk_manager import AdaptiveRiskManager
-from executor import BinanceExecutor
+from executor import BinanceExecutor, create_connector
 from logger_config import setup_logging
 from telegram_notifier import TelegramNotifier
 from utils import load_config, validate_config
 
+# Longest wait for a candle-close event before running a cycle anyway (seconds)
+IDLE_FALLBACK_INTERVAL = 60
+
+try:
+    from uvloop import run as run_event_loop
+except ImportError:  # uvloop is an optional dependency (not available on Windows)
+    from asyncio import run as run_event_loop
+
 
 class TradingBot:
     """Main trading bot class orchestrating all components"""
@@ -37,12 +46,12 @@ class TradingBot:
         self.indicators = TechnicalIndicators(self.config['indicators'])
         self.strategy = TrendFollowingStrategy(self.config)
         self.risk_manager = AdaptiveRiskManager(self.config['risk_management'])
-        self.executor = BinanceExecutor(self.config)
         
-        # Optional Telegram notifications
+        # Exchange and Telegram clients share one HTTP session, opened in start()
+        # so every failure after it is cleaned up by shutdown()
+        self._http = None
+        self.executor = None
         self.telegram = None
-        if self.config['telegram']['enabled']:
-            self.telegram = TelegramNotifier(self.config['telegram'])
         
         # Bot state
         self.is_running = False
@@ -53,23 +62,48 @@ class TradingBot:
     
     async def start(self):
         """Start the trading bot main loop"""
-        self.logger.info("Starting trading bot...")
-        self.is_running = True
-        
-        if self.telegram:
-            await self.telegram.send_message("🤖 Trading bot started")
+        self.logger.info(f"Starting trading bot on {type(asyncio.get_running_loop()).__module__} event loop...")
         
         try:
+            # One keep-alive connection pool shared by the exchange and Telegram clients
+            self._http = aiohttp.ClientSession(connector=create_connector(limit=100))
+            self.executor = BinanceExecutor(self.config, session=self._http)
+            
+            # Optional Telegram notifications
+            if self.config['telegram']['enabled']:
+                self.telegram = TelegramNotifier(self.config['telegram'], session=self._http)
+            
+            await self.executor.connect()
+            
+            # Size orders on the symbol's exact price/quantity grid when available
+            filters = await self.executor.load_symbol_filters()
+            if filters:
+                self.risk_manager.set_symbol_filters(*filters)
+            
+            await self.executor.start_kline_stream()
+            await self.executor.start_user_stream()
+            self.is_running = True
+            
+            if self.telegram:
+                self.telegram.enqueue("🤖 Trading bot started")
+            
             while self.is_running:
                 await self.run_trading_cycle()
-                await asyncio.sleep(self.config['execution']['check_interval'])
+                
+                # Without a position, entries are only evaluated when a candle closes;
+                # an open position keeps the check_interval for trailing stops and exits
+                if self.current_position:
+                    timeout = self.config['execution']['check_interval']
+                else:
+                    timeout = IDLE_FALLBACK_INTERVAL
+                await self.executor.wait_for_candle_close(timeout)
                 
         except KeyboardInterrupt:
             self.logger.info("Received shutdown signal")
         except Exception as e:
-            self.logger.error(f"Unexpected error in main loop: {e}")
+            self.logger.error(f"Unexpected error in trading bot: {e}")
             if self.telegram:
-                await self.telegram.send_message(f"❌ Bot error: {e}")
+                self.telegram.enqueue(f"❌ Bot error: {e}")
         finally:
             await self.shutdown()
     
@@ -82,8 +116,9 @@ class TradingBot:
                 self.logger.warning("Failed to get market data")
                 return
             
-            # Calculate technical indicators
-            indicators_data = self.indicators.calculate_all(market_data)
+            # Update technical indicators with the newly closed candles
+            # (the last, still forming candle is previewed, not committed)
+            indicators_data = self.indicators.calculate_incremental(market_data, last_bar_open=True)
             
             # Check current position status
             current_position = await self.executor.get_current_position()
@@ -139,7 +174,7 @@ class TradingBot:
                              f"Quantity: {risk_params['quantity']}\n"
                              f"Stop Loss: {risk_params['stop_loss']}\n"
                              f"Take Profit: {risk_params['take_profit']}")
-                    await self.telegram.send_message(message)
+                    self.telegram.enqueue(message)
             else:
                 self.logger.error(f"Trade execution failed: {trade_result['error']}")
                 
@@ -181,7 +216,7 @@ class TradingBot:
                                  f"Reason: {exit_signal['reason']}\n"
                                  f"PnL: {pnl}\n"
                                  f"Exit Price: {current_price}")
-                        await self.telegram.send_message(message)
+                        self.telegram.enqueue(message)
                         
         except Exception as e:
             self.logger.error(f"Error managing position: {e}")
@@ -196,7 +231,13 @@ class TradingBot:
             await self.executor.close_position("Bot shutdown")
         
         if self.telegram:
-            await self.telegram.send_message("🛑 Trading bot stopped")
+            self.telegram.enqueue("🛑 Trading bot stopped")
+            await self.telegram.close()
+        
+        if self.executor:
+            await self.executor.aclose()
+        if self._http:
+            await self._http.close()
         
         self.logger.info("Trading bot shutdown complete")
 
@@ -211,4 +252,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_event_loop(main())
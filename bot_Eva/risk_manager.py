@@ -4,9 +4,118 @@ Handles position sizing, stop losses, and risk calculations based on volatility
 """
 
 import logging
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, NamedTuple, Optional
 import math
 
+import numpy as np
+
+from utils import step_decimals
+
+
+# Minimum position value accepted by the exchange ($10)
+MIN_NOTIONAL = 10.0
+
+
+class _Sizing(NamedTuple):
+    """Result of the pure position sizing math"""
+    quantity: float
+    risk_amount: float
+    stop_distance: float
+    target_distance: float
+    stop_loss_long: float
+    stop_loss_short: float
+    take_profit_long: float
+    take_profit_short: float
+    min_notional_adjusted: bool
+
+
+def _round8(value: float) -> float:
+    """Round to 8 decimals (half up) without going through PyFloat_Round"""
+    return math.floor(value * 1e8 + 0.5) / 1e8
+
+
+@lru_cache(maxsize=1024)
+def _sizing(balance_q: float, price_q: float, atr_q: float,
+            stop_mult: float, target_mult: float) -> _Sizing:
+    """
+    Position size, stops and targets for quantized (balance, price, ATR) inputs
+    Pure function so repeated ticks with the same inputs hit the cache.
+    """
+    # Risk amount (1% of capital)
+    risk_amount = balance_q * 0.01  # 1% risk per trade
+    
+    # Stop loss distance (1.5 * ATR)
+    stop_distance = stop_mult * atr_q
+    
+    # Calculate position size
+    position_size = risk_amount / stop_distance
+    
+    # Take profit distance (3.0 * ATR for 1:2 R:R)
+    target_distance = target_mult * atr_q
+    
+    # Ensure minimum position size constraints
+    adjusted = position_size * price_q < MIN_NOTIONAL
+    if adjusted:
+        position_size = MIN_NOTIONAL / price_q
+    
+    # Stop and target levels rounded together in one vector op
+    levels = np.round(np.array([
+        price_q - stop_distance,    # stop loss long
+        price_q + stop_distance,    # stop loss short
+        price_q + target_distance,  # take profit long
+        price_q - target_distance   # take profit short
+    ]), 8).tolist()
+    
+    return _Sizing(round(position_size, 6), risk_amount, stop_distance, target_distance,
+                   *levels, adjusted)
+
+
+def _floor_units(value: float, unit: float) -> int:
+    """Whole units (ticks/steps) in value, tolerant to float representation error"""
+    return math.floor(value / unit + 1e-9)
+
+
+def _distance_units(value: float, unit: float) -> int:
+    """
+    Whole ticks covering a stop/target distance, at least one
+    Rounded away from the entry so the grid never tightens the configured risk.
+    """
+    return max(1, math.ceil(value / unit - 1e-9))
+
+
+@lru_cache(maxsize=1024)
+def _sizing_ticks(balance_q: float, price_ticks: int, atr_q: float, stop_mult: float,
+                  target_mult: float, tick: float, step: float) -> _Sizing:
+    """
+    Same as _sizing, but with prices in integer ticks and quantity in integer steps
+    Levels land exactly on the exchange price grid; only the final conversion
+    back to price/quantity units is floating point.
+    """
+    price = price_ticks * tick
+    risk_amount = balance_q * 0.01  # 1% risk per trade
+    stop_ticks = _distance_units(stop_mult * atr_q, tick)
+    target_ticks = _distance_units(target_mult * atr_q, tick)
+    stop_distance = stop_ticks * tick
+    
+    quantity_steps = _floor_units(risk_amount / stop_distance, step)
+    
+    # Smallest whole number of steps that meets the minimum notional
+    adjusted = quantity_steps * step * price < MIN_NOTIONAL
+    if adjusted:
+        quantity_steps = math.ceil(MIN_NOTIONAL / (price * step))
+    
+    price_decimals = step_decimals(tick)
+    return _Sizing(
+        round(quantity_steps * step, step_decimals(step)), risk_amount,
+        stop_distance, target_ticks * tick,
+        round((price_ticks - stop_ticks) * tick, price_decimals),
+        round((price_ticks + stop_ticks) * tick, price_decimals),
+        round((price_ticks + target_ticks) * tick, price_decimals),
+        round((price_ticks - target_ticks) * tick, price_decimals),
+        adjusted
+    )
+
 
 class AdaptiveRiskManager:
     """Adaptive risk management based on market volatility"""
@@ -15,6 +124,17 @@ class AdaptiveRiskManager:
         """Initialize risk manager with configuration"""
         self.config = config
         self.logger = logging.getLogger(__name__)
+        
+        # Exchange price/quantity grid (None until set_symbol_filters is called)
+        self._tick: Optional[float] = None
+        self._step: Optional[float] = None
+    
+    def set_symbol_filters(self, tick_size: float, step_size: float):
+        """Use the symbol's tickSize/stepSize: prices in whole ticks, quantities in whole steps"""
+        self._tick = tick_size
+        self._step = step_size
+        self._price_decimals = step_decimals(tick_size)
+        self._qty_decimals = step_decimals(step_size)
     
     def calculate_position_size(self, account_balance: float, price: float, atr: float) -> Dict[str, Any]:
         """
@@ -22,46 +142,36 @@ class AdaptiveRiskManager:
         Formula: position_size = (capital_total * risk_percent) / (atr_multiplier * ATR)
         """
         try:
-            # Risk amount (1% of capital)
-            risk_amount = account_balance * 0.01  # 1% risk per trade
-            
-            # Stop loss distance (1.5 * ATR)
-            stop_distance = self.config['atr_stop_multiplier'] * atr
-            
-            # Calculate position size
-            position_size = risk_amount / stop_distance
-            
-            # Calculate stop loss and take profit prices
-            stop_loss_long = price - stop_distance
-            stop_loss_short = price + stop_distance
+            if self._tick is None:
+                sizing = _sizing(
+                    round(account_balance, 2), _round8(price), _round8(atr),
+                    self.config['atr_stop_multiplier'], self.config['atr_target_multiplier']
+                )
+            else:
+                sizing = _sizing_ticks(
+                    round(account_balance, 2), round(price / self._tick), _round8(atr),
+                    self.config['atr_stop_multiplier'], self.config['atr_target_multiplier'],
+                    self._tick, self._step
+                )
             
-            # Take profit distance (3.0 * ATR for 1:2 R:R)
-            target_distance = self.config['atr_target_multiplier'] * atr
-            take_profit_long = price + target_distance
-            take_profit_short = price - target_distance
-            
-            # Ensure minimum position size constraints
-            min_notional = 10.0  # Minimum $10 position
-            if position_size * price < min_notional:
-                position_size = min_notional / price
-                self.logger.warning(f"Position size adjusted to meet minimum notional requirement")
-            
-            # Round to appropriate precision
-            position_size = self._round_quantity(position_size)
+            if sizing.min_notional_adjusted:
+                self.logger.warning("Position size adjusted to meet minimum notional requirement")
             
+            position_size = sizing.quantity
+            risk_amount = sizing.risk_amount
             risk_params = {
                 'quantity': position_size,
                 'risk_amount': risk_amount,
-                'stop_distance': stop_distance,
-                'target_distance': target_distance,
-                'stop_loss_long': round(stop_loss_long, 8),
-                'stop_loss_short': round(stop_loss_short, 8),
-                'take_profit_long': round(take_profit_long, 8),
-                'take_profit_short': round(take_profit_short, 8),
-                'risk_reward_ratio': target_distance / stop_distance
+                'stop_distance': sizing.stop_distance,
+                'target_distance': sizing.target_distance,
+                'stop_loss_long': sizing.stop_loss_long,
+                'stop_loss_short': sizing.stop_loss_short,
+                'take_profit_long': sizing.take_profit_long,
+                'take_profit_short': sizing.take_profit_short,
+                'risk_reward_ratio': sizing.target_distance / sizing.stop_distance
             }
             
-            self.logger.info(f"Position size calculated: {position_size}, Risk: ${risk_amount:.2f}")
+            self.logger.info("Position size calculated: %s, Risk: $%.2f", position_size, risk_amount)
             return risk_params
             
         except Exception as e:
@@ -87,21 +197,30 @@ class AdaptiveRiskManager:
             adx_multiplier = 1.0 + (adx - 25) / 100  # Adjusts based on trend strength
             trailing_distance = self.config['atr_stop_multiplier'] * atr * adx_multiplier
             
+            # With symbol filters, compare whole ticks (exact integer comparisons)
+            stop_level = current_stop
+            if self._tick is not None:
+                current_price = round(current_price / self._tick)
+                stop_level = round(current_stop / self._tick)
+                trailing_distance = _distance_units(trailing_distance, self._tick)
+            
             if position_side == 'BUY':
                 # For long positions, trail stop upward only
                 new_stop = current_price - trailing_distance
                 # Only update if new stop is higher than current stop
-                if new_stop > current_stop:
-                    self.logger.info(f"Trailing stop updated (LONG): {current_stop:.8f} -> {new_stop:.8f}")
-                    return round(new_stop, 8)
+                if new_stop > stop_level:
+                    new_stop = self._round_price(new_stop)
+                    self.logger.info("Trailing stop updated (LONG): %.8f -> %.8f", current_stop, new_stop)
+                    return new_stop
                     
             elif position_side == 'SELL':
                 # For short positions, trail stop downward only
                 new_stop = current_price + trailing_distance
                 # Only update if new stop is lower than current stop
-                if new_stop < current_stop:
-                    self.logger.info(f"Trailing stop updated (SHORT): {current_stop:.8f} -> {new_stop:.8f}")
-                    return round(new_stop, 8)
+                if new_stop < stop_level:
+                    new_stop = self._round_price(new_stop)
+                    self.logger.info("Trailing stop updated (SHORT): %.8f -> %.8f", current_stop, new_stop)
+                    return new_stop
             
             # Return current stop if no update needed
             return current_stop
@@ -138,7 +257,7 @@ class AdaptiveRiskManager:
             # Check risk-reward ratio
             rr_ratio = risk_params.get('risk_reward_ratio', 0)
             if rr_ratio < 1.5:  # Minimum 1.5:1 R:R
-                self.logger.warning(f"Low risk-reward ratio: {rr_ratio:.2f}")
+                self.logger.warning("Low risk-reward ratio: %.2f", rr_ratio)
                 return False
             
             return True
@@ -162,9 +281,19 @@ class AdaptiveRiskManager:
     
     def _round_quantity(self, quantity: float) -> float:
         """Round quantity to appropriate precision based on symbol"""
+        if self._step is not None:
+            # Whole steps, rounded down so the exchange never rejects the size
+            return round(_floor_units(quantity, self._step) * self._step, self._qty_decimals)
+        
         # For most crypto pairs, 6 decimal places is sufficient
         return round(quantity, 6)
     
+    def _round_price(self, price: float) -> float:
+        """Price in quote units (price is in whole ticks when symbol filters are set)"""
+        if self._tick is not None:
+            return round(price * self._tick, self._price_decimals)
+        return round(price, 8)
+    
     def _get_default_risk_params(self) -> Dict[str, Any]:
         """Return default risk parameters in case of error"""
         return {
@@ -6,6 +6,7 @@ Script de Configuração Rápida do Bot de Trading Binance
 import os
 import shutil
 import sys
+from importlib.util import find_spec
 from pathlib import Path
 
 
@@ -37,16 +38,13 @@ def setup_bot():
     
     # Verificar dependências
     print("\n📦 Verificando dependências...")
-    try:
-        import pandas
-        import numpy
-        import binance
-        import yaml
-        print("✅ Todas as dependências principais encontradas")
-    except ImportError as e:
-        print(f"❌ Dependência faltando: {e}")
+    # Só verifica se os módulos existem, sem executar a importação
+    missing = [name for name in ('numpy', 'aiohttp', 'yaml') if find_spec(name) is None]
+    if missing:
+        print(f"❌ Dependência faltando: {', '.join(missing)}")
         print("Execute: pip install -r requirements.txt")
         return False
+    print("✅ Todas as dependências principais encontradas")
     
     # Instruções finais
     print("\n🎯 Configuração concluída!")
@@ -4,8 +4,46 @@ Implements the trend following strategy with multiple confirmation signals
 """
 
 import logging
+from enum import IntEnum
 from typing import Dict, Any, List
+import numpy as np
 from indicators import TechnicalIndicators
+from _signals import (
+    entry_masks, entry_actions_batch, book_depth, ENTRY_ALL, ENTRY_CONDITIONS
+)
+
+
+# Reason texts per direction: trend, momentum and the RSI level it must avoid
+_SIDE_REASONS = {
+    'BUY': ("Price above EMA 200 (bullish trend)",
+            "MACD histogram positive (bullish momentum)", "overbought"),
+    'SELL': ("Price below EMA 200 (bearish trend)",
+             "MACD histogram negative (bearish momentum)", "oversold")
+}
+
+
+class ExitReason(IntEnum):
+    """Machine-readable code of a strategy exit decision (see get_exit_signal)"""
+    NONE = 0
+    TREND_REVERSAL = 1
+    WEAK_TREND = 2
+    ERROR = 3
+
+
+def _copy_signal(signal: Dict[str, Any]) -> Dict[str, Any]:
+    """Caller-owned copy of an entry signal (reasons list included)"""
+    return {**signal, 'reasons': list(signal['reasons'])}
+
+
+# Book depth up to which a plain Python sum beats building an array
+_SMALL_BOOK_LEVELS = 8
+
+
+def _depth_volume(levels: List) -> float:
+    """Total quantity of exchange-shape [price, qty] levels (strings or numbers)"""
+    if len(levels) <= _SMALL_BOOK_LEVELS:
+        return sum(float(level[1]) for level in levels)
+    return float(np.asarray(levels, dtype=np.float64).reshape(-1, 2)[:, 1].sum())
 
 
 class TrendFollowingStrategy:
@@ -17,181 +55,137 @@ class TrendFollowingStrategy:
         self.logger = logging.getLogger(__name__)
         self.indicators_config = config['indicators']
         self.risk_config = config['risk_management']
+        
+        # Thresholds and sizes are fixed for the session: read them once
+        self._vol_mult = self.indicators_config['volume_multiplier']
+        self._min_adx = self.risk_config.get('min_adx_for_trend', 25)
+        self._ob_levels = config['execution']['orderbook_levels']
+        self._adx_exit = 20
+        
+        # Last (bar timestamp, inputs) fingerprint and the signal it produced
+        self._last_key = None
+        self._last_signal = None
     
     def get_entry_signal(self, market_data: Dict, indicators: Dict) -> Dict[str, Any]:
         """
         Analyze market conditions and return entry signal
         Returns: {'action': 'BUY'/'SELL'/'NONE', 'confidence': float, 'reasons': list}
+        Repeated calls for the same bar with unchanged price and indicators
+        (intra-bar polling) reuse the cached evaluation; every call gets its own
+        copy, so callers may annotate the result.
         """
         try:
-            current_price = market_data['close'][-1]
-            
-            # Initialize signal
-            signal = {
-                'action': 'NONE',
-                'confidence': 0.0,
-                'reasons': []
-            }
+            price = market_data['close'][-1]
             
-            # Check bullish conditions
-            bullish_conditions = self._check_bullish_conditions(current_price, indicators)
-            bearish_conditions = self._check_bearish_conditions(current_price, indicators)
+            timestamps = market_data.get('timestamp')
+            key = None
+            if timestamps is not None and len(timestamps):
+                key = (timestamps[-1], price, indicators['ema_200'], indicators['macd_histogram'],
+                       indicators['rsi'], indicators['volume_ratio'], indicators['adx'])
+                if key == self._last_key:
+                    return _copy_signal(self._last_signal)
             
-            if bullish_conditions['valid']:
-                signal['action'] = 'BUY'
-                signal['confidence'] = bullish_conditions['confidence']
-                signal['reasons'] = bullish_conditions['reasons']
-                
-            elif bearish_conditions['valid']:
-                signal['action'] = 'SELL'
-                signal['confidence'] = bearish_conditions['confidence']
-                signal['reasons'] = bearish_conditions['reasons']
+            signal = self._evaluate_signals(price, indicators)
+            self._last_key, self._last_signal = key, signal
             
-            self.logger.info(f"Entry signal: {signal['action']} (confidence: {signal['confidence']:.2f})")
-            return signal
+            self.logger.info("Entry signal: %s (confidence: %.2f)", signal['action'], signal['confidence'])
+            return _copy_signal(signal)
             
         except Exception as e:
-            self.logger.error(f"Error generating entry signal: {e}")
+            self.logger.error("Error generating entry signal: %s", e)
             return {'action': 'NONE', 'confidence': 0.0, 'reasons': []}
     
-    def _check_bullish_conditions(self, price: float, indicators: Dict) -> Dict:
-        """Check all bullish entry conditions"""
-        conditions = []
-        reasons = []
-        
-        # 1. Trend: Price above EMA 200
-        if price > indicators['ema_200']:
-            conditions.append(True)
-            reasons.append("Price above EMA 200 (bullish trend)")
-        else:
-            conditions.append(False)
-            reasons.append("Price below EMA 200 (not bullish trend)")
-        
-        # 2. MACD: Histogram positive
-        if indicators['macd_histogram'] > 0:
-            conditions.append(True)
-            reasons.append("MACD histogram positive (bullish momentum)")
-        else:
-            conditions.append(False)
-            reasons.append("MACD histogram negative (not bullish momentum)")
-        
-        # 3. RSI: Not overbought (< 70)
-        if indicators['rsi'] < 70:
-            conditions.append(True)
-            reasons.append(f"RSI {indicators['rsi']:.1f} not overbought")
-        else:
-            conditions.append(False)
-            reasons.append(f"RSI {indicators['rsi']:.1f} overbought")
-        
-        # 4. Volume: Above average
-        if indicators['volume_ratio'] > self.indicators_config['volume_multiplier']:
-            conditions.append(True)
-            reasons.append(f"Volume {indicators['volume_ratio']:.1f}x above average")
-        else:
-            conditions.append(False)
-            reasons.append(f"Volume {indicators['volume_ratio']:.1f}x below threshold")
+    def _evaluate_signals(self, price: float, indicators: Dict) -> Dict[str, Any]:
+        """
+        Check bullish and bearish entry conditions in one compiled call
+        All five conditions of a direction must hold for a signal; the reasons
+        are only formatted for the direction that triggers.
+        """
+        rsi = indicators['rsi']
+        volume_ratio = indicators['volume_ratio']
+        adx = indicators['adx']
+        bullish, bearish = entry_masks(
+            price, indicators['ema_200'], indicators['macd_histogram'], rsi,
+            volume_ratio, self._vol_mult, adx, self._min_adx
+        )
         
-        # 5. Trend strength (ADX)
-        min_adx = self.risk_config.get('min_adx_for_trend', 25)
-        if indicators['adx'] >= min_adx:
-            conditions.append(True)
-            reasons.append(f"ADX {indicators['adx']:.1f} shows strong trend")
+        if bullish == ENTRY_ALL:
+            action = 'BUY'
+        elif bearish == ENTRY_ALL:
+            action = 'SELL'
         else:
-            conditions.append(False)
-            reasons.append(f"ADX {indicators['adx']:.1f} shows weak trend")
-        
-        # All conditions must be met
-        all_valid = all(conditions)
-        confidence = sum(conditions) / len(conditions)
+            self.logger.debug("Entry conditions met: bullish %d/%d, bearish %d/%d",
+                              bullish.bit_count(), ENTRY_CONDITIONS,
+                              bearish.bit_count(), ENTRY_CONDITIONS)
+            return {'action': 'NONE', 'confidence': 0.0, 'reasons': []}
         
+        trend_reason, momentum_reason, rsi_extreme = _SIDE_REASONS[action]
         return {
-            'valid': all_valid,
-            'confidence': confidence,
-            'reasons': reasons
+            'action': action,
+            'confidence': 1.0,
+            'reasons': [
+                trend_reason,
+                momentum_reason,
+                f"RSI {rsi:.1f} not {rsi_extreme}",
+                f"Volume {volume_ratio:.1f}x above average",
+                f"ADX {adx:.1f} shows strong trend"
+            ]
         }
     
-    def _check_bearish_conditions(self, price: float, indicators: Dict) -> Dict:
-        """Check all bearish entry conditions"""
-        conditions = []
-        reasons = []
-        
-        # 1. Trend: Price below EMA 200
-        if price < indicators['ema_200']:
-            conditions.append(True)
-            reasons.append("Price below EMA 200 (bearish trend)")
-        else:
-            conditions.append(False)
-            reasons.append("Price above EMA 200 (not bearish trend)")
-        
-        # 2. MACD: Histogram negative
-        if indicators['macd_histogram'] < 0:
-            conditions.append(True)
-            reasons.append("MACD histogram negative (bearish momentum)")
-        else:
-            conditions.append(False)
-            reasons.append("MACD histogram positive (not bearish momentum)")
-        
-        # 3. RSI: Not oversold (> 30)
-        if indicators['rsi'] > 30:
-            conditions.append(True)
-            reasons.append(f"RSI {indicators['rsi']:.1f} not oversold")
-        else:
-            conditions.append(False)
-            reasons.append(f"RSI {indicators['rsi']:.1f} oversold")
-        
-        # 4. Volume: Above average
-        if indicators['volume_ratio'] > self.indicators_config['volume_multiplier']:
-            conditions.append(True)
-            reasons.append(f"Volume {indicators['volume_ratio']:.1f}x above average")
-        else:
-            conditions.append(False)
-            reasons.append(f"Volume {indicators['volume_ratio']:.1f}x below threshold")
-        
-        # 5. Trend strength (ADX)
-        min_adx = self.risk_config.get('min_adx_for_trend', 25)
-        if indicators['adx'] >= min_adx:
-            conditions.append(True)
-            reasons.append(f"ADX {indicators['adx']:.1f} shows strong trend")
-        else:
-            conditions.append(False)
-            reasons.append(f"ADX {indicators['adx']:.1f} shows weak trend")
-        
-        # All conditions must be met
-        all_valid = all(conditions)
-        confidence = sum(conditions) / len(conditions)
+    def get_entry_signals_batch(self, market_data: Dict, indicators: Dict) -> np.ndarray:
+        """
+        Entry actions for every bar at once (backtests)
+        indicators holds one array per indicator, aligned with market_data['close'].
+        Returns an int8 array: 1 = BUY, -1 = SELL, 0 = NONE.
+        """
+        def column(values):
+            return np.asarray(values, dtype=np.float64)
         
-        return {
-            'valid': all_valid,
-            'confidence': confidence,
-            'reasons': reasons
-        }
+        return entry_actions_batch(
+            column(market_data['close']), column(indicators['ema_200']),
+            column(indicators['macd_histogram']), column(indicators['rsi']),
+            column(indicators['volume_ratio']), float(self._vol_mult),
+            column(indicators['adx']), float(self._min_adx)
+        )
     
     def validate_orderbook_pressure(self, orderbook: Dict, action: str) -> bool:
         """
         Validate order book pressure supports the intended action
+        Accepts the columnar shape returned by the executor and the demo
+        ({'bids_qty': ndarray, 'asks_qty': ndarray, ...}) or the raw exchange
+        shape ({'bids': [[price, qty], ...], 'asks': ...})
         """
         try:
-            if not orderbook or 'bids' not in orderbook or 'asks' not in orderbook:
+            if not orderbook:
                 return False
             
-            # Get top 5 levels
-            levels = self.config['execution']['orderbook_levels']
-            bids = orderbook['bids'][:levels]
-            asks = orderbook['asks'][:levels]
+            # Top levels only (orderbook_levels)
+            levels = self._ob_levels
             
             # Calculate total bid and ask volumes
-            total_bid_volume = sum(float(bid[1]) for bid in bids)
-            total_ask_volume = sum(float(ask[1]) for ask in asks)
+            if 'bids_qty' in orderbook and 'asks_qty' in orderbook:
+                total_bid_volume, total_ask_volume = book_depth(
+                    np.asarray(orderbook['bids_qty'], dtype=np.float64),
+                    np.asarray(orderbook['asks_qty'], dtype=np.float64),
+                    levels
+                )
+            elif 'bids' in orderbook and 'asks' in orderbook:
+                total_bid_volume = _depth_volume(orderbook['bids'][:levels])
+                total_ask_volume = _depth_volume(orderbook['asks'][:levels])
+            else:
+                return False
             
             if action == 'BUY':
                 # For buy orders, we want more bid pressure (buying interest)
                 pressure_valid = total_bid_volume > total_ask_volume
-                self.logger.info(f"Buy pressure check: Bids={total_bid_volume:.2f}, Asks={total_ask_volume:.2f}, Valid={pressure_valid}")
+                self.logger.info("Buy pressure check: Bids=%.2f, Asks=%.2f, Valid=%s",
+                                 total_bid_volume, total_ask_volume, pressure_valid)
                 
             elif action == 'SELL':
                 # For sell orders, we want more ask pressure (selling interest)
                 pressure_valid = total_ask_volume > total_bid_volume
-                self.logger.info(f"Sell pressure check: Bids={total_bid_volume:.2f}, Asks={total_ask_volume:.2f}, Valid={pressure_valid}")
+                self.logger.info("Sell pressure check: Bids=%.2f, Asks=%.2f, Valid=%s",
+                                 total_bid_volume, total_ask_volume, pressure_valid)
                 
             else:
                 pressure_valid = False
@@ -199,18 +193,23 @@ class TrendFollowingStrategy:
             return pressure_valid
             
         except Exception as e:
-            self.logger.error(f"Error validating orderbook pressure: {e}")
+            self.logger.error("Error validating orderbook pressure: %s", e)
             return False
     
     def get_exit_signal(self, market_data: Dict, indicators: Dict, position: Dict) -> Dict[str, Any]:
         """
         Check if current position should be exited
-        Returns: {'should_exit': bool, 'reason': str}
+        Returns: {'should_exit': bool, 'reason': str, 'reason_code': ExitReason}
+        reason is the human-readable text for logs and alerts.
         """
         try:
+            # Every value is read once; the checks below only use locals
             current_price = market_data['close'][-1]
             position_side = position['side']
-            entry_price = position['entry_price']
+            ema_200 = indicators['ema_200']
+            macd_histogram = indicators['macd_histogram']
+            rsi = indicators['rsi']
+            adx = indicators['adx']
             
             # Check stop loss and take profit (handled by executor)
             # Here we check for strategy-based exits
@@ -218,24 +217,24 @@ class TrendFollowingStrategy:
             # Exit on trend reversal
             if position_side == 'BUY':
                 # Exit long position if trend turns bearish
-                if (current_price < indicators['ema_200'] and 
-                    indicators['macd_histogram'] < 0 and
-                    indicators['rsi'] > 70):
-                    return {'should_exit': True, 'reason': 'Trend reversal (bearish)'}
+                if current_price < ema_200 and macd_histogram < 0 and rsi > 70:
+                    return {'should_exit': True, 'reason': 'Trend reversal (bearish)',
+                            'reason_code': ExitReason.TREND_REVERSAL}
                     
             elif position_side == 'SELL':
                 # Exit short position if trend turns bullish
-                if (current_price > indicators['ema_200'] and 
-                    indicators['macd_histogram'] > 0 and
-                    indicators['rsi'] < 30):
-                    return {'should_exit': True, 'reason': 'Trend reversal (bullish)'}
+                if current_price > ema_200 and macd_histogram > 0 and rsi < 30:
+                    return {'should_exit': True, 'reason': 'Trend reversal (bullish)',
+                            'reason_code': ExitReason.TREND_REVERSAL}
             
             # Exit on weak trend
-            if indicators['adx'] < 20:
-                return {'should_exit': True, 'reason': 'Weak trend (ADX < 20)'}
+            if adx < self._adx_exit:
+                return {'should_exit': True, 'reason': 'Weak trend (ADX < 20)',
+                        'reason_code': ExitReason.WEAK_TREND}
             
-            return {'should_exit': False, 'reason': 'No exit signal'}
+            return {'should_exit': False, 'reason': 'No exit signal', 'reason_code': ExitReason.NONE}
             
         except Exception as e:
-            self.logger.error(f"Error checking exit signal: {e}")
-            return {'should_exit': False, 'reason': 'Error in exit analysis'}
+            self.logger.error("Error checking exit signal: %s", e)
+            return {'should_exit': False, 'reason': 'Error in exit analysis',
+                    'reason_code': ExitReason.ERROR}
@@ -0,0 +1,44 @@
+"""
+Parallel Backtests
+Runs the entry strategy over several symbols' histories on separate processes
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+from indicators import TechnicalIndicators
+from strategy import TrendFollowingStrategy
+
+
+def backtest_symbol(market_data: Dict, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Entry actions for every bar of one symbol's history
+    Builds its own indicator and strategy instances, so it is safe to run in a
+    worker process.
+    """
+    indicators = TechnicalIndicators(config['indicators']).calculate_series(market_data)
+    actions = TrendFollowingStrategy(config).get_entry_signals_batch(market_data, indicators)
+    
+    return {
+        'bars': len(actions),
+        'buy_signals': int((actions == 1).sum()),
+        'sell_signals': int((actions == -1).sum()),
+        'actions': actions
+    }
+
+
+def backtest_all(data_map: Dict[str, Dict], config: Dict[str, Any],
+                 max_workers: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Backtest every symbol of data_map ({symbol: market_data}) across CPU cores
+    Yields (symbol, result) in completion order. Where worker processes are
+    spawned (Windows, macOS) call it under `if __name__ == '__main__':`.
+    """
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(backtest_symbol, market_data, config): symbol
+            for symbol, market_data in data_map.items()
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
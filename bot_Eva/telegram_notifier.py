@@ -4,18 +4,132 @@ Handles sending notifications via Telegram bot
 """
 
 import os
+import random
 import asyncio
 import logging
+import time
 from typing import Dict, Any, Optional
-import requests
-from datetime import datetime
+
+import aiohttp
+
+from utils import AsyncTokenBucket
+
+try:
+    from orjson import dumps as json_dumps
+except ImportError:  # orjson is an optional dependency
+    import json
+    
+    def json_dumps(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON bytes (orjson-compatible fallback)"""
+        return json.dumps(obj, ensure_ascii=False).encode()
+
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+# Queued messages are merged into one sendMessage up to this size (API limit is 4096)
+BATCH_MAX_CHARS = 3800
+
+# Attempts per message (429, 5xx and network errors are retried)
+SEND_ATTEMPTS = 3
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Emoji lookups for alert headers (anything else gets the red marker)
+_ACTION_EMOJI = {"BUY": "🟢", "SELL": "🔴"}
+_STATUS_EMOJI = {"ACTIVE": "🟢", "IDLE": "🟡"}
+
+# (epoch second, formatted) of the last message timestamp
+_ts_cache = (0, "")
+
+
+def _timestamp() -> str:
+    """Local time as YYYY-MM-DD HH:MM:SS, formatted at most once per second"""
+    global _ts_cache
+    now_s = int(time.time())
+    if now_s != _ts_cache[0]:
+        _ts_cache = (now_s, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now_s)))
+    return _ts_cache[1]
+
+
+# Alert message templates (HTML parse mode), filled with str.format_map
+TRADE_TMPL = """
+{emoji} <b>TRADE EXECUTED</b>
+
+<b>Action:</b> {action}
+<b>Symbol:</b> {symbol}
+<b>Price:</b> ${price:,.4f}
+<b>Quantity:</b> {quantity}
+<b>Stop Loss:</b> ${stop_loss:,.4f}
+<b>Take Profit:</b> ${take_profit:,.4f}
+
+<i>Risk-Reward Ratio: 1:2</i>
+""".strip()
+
+POSITION_CLOSED_TMPL = """
+{emoji} <b>POSITION CLOSED</b>
+
+<b>Symbol:</b> {symbol}
+<b>Exit Price:</b> ${exit_price:,.4f}
+<b>PnL:</b> {pnl_text}
+<b>Reason:</b> {reason}
+
+<i>Position management complete</i>
+""".strip()
+
+RISK_TMPL = """
+⚠️ <b>RISK ALERT: {alert_type}</b>
+
+{message_text}
+
+<i>Immediate attention required</i>
+""".strip()
+
+ERROR_TMPL = """
+🚨 <b>ERROR ALERT</b>
+
+<b>Type:</b> {error_type}
+<b>Message:</b> {error_message}
+
+<i>Bot may require intervention</i>
+""".strip()
+
+DAILY_SUMMARY_TMPL = """
+📊 <b>DAILY SUMMARY</b>
+
+<b>Trades Executed:</b> {trades_count}
+<b>Win Rate:</b> {win_rate:.1f}%
+<b>Total PnL:</b> ${total_pnl:,.2f}
+<b>Best Trade:</b> ${best_trade:,.2f}
+<b>Worst Trade:</b> ${worst_trade:,.2f}
+
+<b>Account Balance:</b> ${account_balance:,.2f}
+<b>Drawdown:</b> {drawdown:.2f}%
+
+<i>End of day report</i>
+""".strip()
+
+SYSTEM_STATUS_TMPL = """
+{emoji} <b>SYSTEM STATUS</b>
+
+<b>Status:</b> {status}
+<b>Uptime:</b> {uptime}
+<b>Last Trade:</b> {last_trade}
+
+<i>System monitoring update</i>
+""".strip()
+
+# Defaults for fields missing from send_daily_summary's summary_data
+_SUMMARY_DEFAULTS = {
+    'trades_count': 0, 'win_rate': 0, 'total_pnl': 0, 'best_trade': 0,
+    'worst_trade': 0, 'account_balance': 0, 'drawdown': 0
+}
 
 
 class TelegramNotifier:
     """Handles Telegram notifications for trading bot events"""
     
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize Telegram notifier"""
+    def __init__(self, config: Dict[str, Any], session: Optional[aiohttp.ClientSession] = None):
+        """Initialize Telegram notifier (an injected session is shared and left open by close())"""
         self.config = config
         self.logger = logging.getLogger(__name__)
         
@@ -23,14 +137,86 @@ class TelegramNotifier:
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN', config.get('bot_token', ''))
         self.chat_id = os.getenv('TELEGRAM_CHAT_ID', config.get('chat_id', ''))
         
+        # Keep-alive session shared by every message (own one created on first send)
+        self._session = session
+        self._owns_session = session is None
+        self._timeout = aiohttp.ClientTimeout(total=10)
+        
+        # Telegram limits: ~30 messages/s per bot, 1 message/s per chat
+        self._global_bucket = AsyncTokenBucket(30, 30)
+        self._chat_bucket = AsyncTokenBucket(1, 1)
+        self._send_slots = asyncio.Semaphore(4)  # concurrent requests in flight
+        
+        # Fire-and-forget queue drained by a background task (started on first enqueue)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        self._worker: Optional[asyncio.Task] = None
+        
         if not self.bot_token or not self.chat_id:
             self.logger.warning("Telegram credentials not found. Notifications disabled.")
             self.enabled = False
         else:
             self.enabled = True
-            self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+            self.send_url = f"{TELEGRAM_API_URL}/bot{self.bot_token}/sendMessage"
             self.logger.info("Telegram notifications enabled")
     
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._owns_session and (self._session is None or self._session.closed):
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=75)
+            )
+        return self._session
+    
+    def enqueue(self, message: str):
+        """Queue a message for background delivery without waiting on the network"""
+        if not self.enabled:
+            return
+        
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._drain())
+        
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.logger.warning("Telegram queue full, dropping message")
+    
+    async def _drain(self):
+        """Send queued messages, merging consecutive ones into a single request"""
+        carry = None
+        while True:
+            batch = [carry if carry is not None else await self._queue.get()]
+            carry = None
+            size = len(batch[0])
+            while not self._queue.empty():
+                message = self._queue.get_nowait()
+                if size + len(message) + 2 > BATCH_MAX_CHARS:
+                    carry = message  # opens the next batch
+                    break
+                batch.append(message)
+                size += len(message) + 2
+            
+            try:
+                await self.send_message("\n\n".join(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def close(self, timeout: float = 10):
+        """Flush queued messages, then stop the worker and close the HTTP session"""
+        if self._worker is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning("Timed out flushing Telegram queue")
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        
+        if self._owns_session:
+            if self._session is not None and not self._session.closed:
+                await self._session.close()
+            self._session = None
+    
     async def send_message(self, message: str, parse_mode: str = "HTML") -> bool:
         """Send a message to Telegram"""
         if not self.enabled:
@@ -38,26 +224,53 @@ class TelegramNotifier:
         
         try:
             # Format message with timestamp
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            formatted_message = f"[{timestamp}]\n{message}"
+            formatted_message = f"[{_timestamp()}]\n{message}"
             
             # Prepare request
-            url = f"{self.base_url}/sendMessage"
             payload = {
                 'chat_id': self.chat_id,
                 'text': formatted_message,
                 'parse_mode': parse_mode
             }
             
-            # Send message
-            response = requests.post(url, json=payload, timeout=10)
+            # Serialized once, reused by every retry
+            body = json_dumps(payload)
+            
+            # Send message once both rate limits allow it
+            session = await self._get_session()
+            await self._global_bucket.acquire()
+            await self._chat_bucket.acquire()
             
-            if response.status_code == 200:
-                self.logger.debug("Telegram message sent successfully")
-                return True
-            else:
-                self.logger.error(f"Failed to send Telegram message: {response.status_code}")
-                return False
+            for attempt in range(SEND_ATTEMPTS):
+                # Exponential backoff with jitter unless Telegram says how long to wait
+                delay = 2 ** attempt + random.random()
+                try:
+                    async with self._send_slots:
+                        async with session.post(self.send_url, data=body, headers=_JSON_HEADERS,
+                                                timeout=self._timeout) as response:
+                            if response.status == 200:
+                                self.logger.debug("Telegram message sent successfully")
+                                return True
+                            
+                            if response.status == 429:
+                                # Flood limit: wait as long as Telegram asks
+                                data = await response.json(content_type=None)
+                                delay = float(data.get('parameters', {}).get('retry_after', delay))
+                            elif response.status < 500:
+                                self.logger.error(f"Failed to send Telegram message: {response.status}")
+                                return False
+                            
+                            error = f"HTTP {response.status}"
+                
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = str(e) or type(e).__name__
+                
+                if attempt + 1 < SEND_ATTEMPTS:
+                    self.logger.warning(f"Telegram send failed ({error}), retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+            
+            self.logger.error(f"Failed to send Telegram message after {SEND_ATTEMPTS} attempts: {error}")
+            return False
                 
         except Exception as e:
             self.logger.error(f"Error sending Telegram message: {e}")
@@ -66,99 +279,57 @@ class TelegramNotifier:
     async def send_trade_alert(self, action: str, symbol: str, price: float, 
                               quantity: float, stop_loss: float, take_profit: float) -> bool:
         """Send trade execution alert"""
-        emoji = "🟢" if action == "BUY" else "🔴"
-        
-        message = f"""
-{emoji} <b>TRADE EXECUTED</b>
-
-<b>Action:</b> {action}
-<b>Symbol:</b> {symbol}
-<b>Price:</b> ${price:,.4f}
-<b>Quantity:</b> {quantity}
-<b>Stop Loss:</b> ${stop_loss:,.4f}
-<b>Take Profit:</b> ${take_profit:,.4f}
-
-<i>Risk-Reward Ratio: 1:2</i>
-        """
+        message = TRADE_TMPL.format_map({
+            'emoji': _ACTION_EMOJI.get(action, "🔴"),
+            'action': action,
+            'symbol': symbol,
+            'price': price,
+            'quantity': quantity,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit
+        })
         
         return await self.send_message(message)
     
     async def send_position_closed_alert(self, symbol: str, pnl: float, 
                                         exit_price: float, reason: str) -> bool:
         """Send position closed alert"""
-        emoji = "✅" if pnl > 0 else "❌"
-        pnl_text = f"+${pnl:,.2f}" if pnl > 0 else f"-${abs(pnl):,.2f}"
-        
-        message = f"""
-{emoji} <b>POSITION CLOSED</b>
-
-<b>Symbol:</b> {symbol}
-<b>Exit Price:</b> ${exit_price:,.4f}
-<b>PnL:</b> {pnl_text}
-<b>Reason:</b> {reason}
-
-<i>Position management complete</i>
-        """
+        message = POSITION_CLOSED_TMPL.format_map({
+            'emoji': "✅" if pnl > 0 else "❌",
+            'symbol': symbol,
+            'exit_price': exit_price,
+            'pnl_text': f"+${pnl:,.2f}" if pnl > 0 else f"-${abs(pnl):,.2f}",
+            'reason': reason
+        })
         
         return await self.send_message(message)
     
     async def send_risk_alert(self, alert_type: str, message_text: str) -> bool:
         """Send risk management alert"""
-        message = f"""
-⚠️ <b>RISK ALERT: {alert_type}</b>
-
-{message_text}
-
-<i>Immediate attention required</i>
-        """
+        message = RISK_TMPL.format_map({'alert_type': alert_type, 'message_text': message_text})
         
         return await self.send_message(message)
     
     async def send_error_alert(self, error_type: str, error_message: str) -> bool:
         """Send error alert"""
-        message = f"""
-🚨 <b>ERROR ALERT</b>
-
-<b>Type:</b> {error_type}
-<b>Message:</b> {error_message}
-
-<i>Bot may require intervention</i>
-        """
+        message = ERROR_TMPL.format_map({'error_type': error_type, 'error_message': error_message})
         
         return await self.send_message(message)
     
     async def send_daily_summary(self, summary_data: Dict[str, Any]) -> bool:
         """Send daily performance summary"""
-        message = f"""
-📊 <b>DAILY SUMMARY</b>
-
-<b>Trades Executed:</b> {summary_data.get('trades_count', 0)}
-<b>Win Rate:</b> {summary_data.get('win_rate', 0):.1f}%
-<b>Total PnL:</b> ${summary_data.get('total_pnl', 0):,.2f}
-<b>Best Trade:</b> ${summary_data.get('best_trade', 0):,.2f}
-<b>Worst Trade:</b> ${summary_data.get('worst_trade', 0):,.2f}
-
-<b>Account Balance:</b> ${summary_data.get('account_balance', 0):,.2f}
-<b>Drawdown:</b> {summary_data.get('drawdown', 0):.2f}%
-
-<i>End of day report</i>
-        """
+        message = DAILY_SUMMARY_TMPL.format_map({**_SUMMARY_DEFAULTS, **summary_data})
         
         return await self.send_message(message)
     
     async def send_system_status(self, status: str, uptime: str, last_trade: str = "N/A") -> bool:
         """Send system status update"""
-        status_emoji = "🟢" if status == "ACTIVE" else "🟡" if status == "IDLE" else "🔴"
-        
-        message = f"""
-{status_emoji} <b>SYSTEM STATUS</b>
-
-<b>Status:</b> {status}
-<b>Uptime:</b> {uptime}
-<b>Last Trade:</b> {last_trade}
-
-<i>System monitoring update</i>
-        """
+        message = SYSTEM_STATUS_TMPL.format_map({
+            'emoji': _STATUS_EMOJI.get(status, "🔴"),
+            'status': status,
+            'uptime': uptime,
+            'last_trade': last_trade
+        })
         
         return await self.send_message(message)
     
@@ -0,0 +1,51 @@
+"""
+Shared test fixtures
+Read-only order books, and strategy instances cached per configuration for
+the whole test session
+"""
+
+import copy
+from types import MappingProxyType
+from typing import Any, Dict
+
+from strategy import TrendFollowingStrategy
+
+
+# Exchange-shape order books ([price, qty] string pairs, best level first)
+OB_BUY_HEAVY = MappingProxyType({
+    'bids': (('50000', '1.0'), ('49950', '0.5'), ('49900', '0.3')),
+    'asks': (('50050', '0.5'), ('50100', '0.3'), ('50150', '0.2'))
+})
+OB_SELL_HEAVY = MappingProxyType({
+    'bids': (('50000', '0.3'), ('49950', '0.2'), ('49900', '0.1')),
+    'asks': (('50050', '1.0'), ('50100', '0.8'), ('50150', '0.5'))
+})
+OB_THIN_BIDS = MappingProxyType({
+    'bids': (('50000', '1.0'), ('49950', '0.5')),
+    'asks': (('50050', '1.2'), ('50100', '0.8'))
+})
+
+
+# freeze(config) -> strategy built from a private copy of that config
+_strategies: Dict[tuple, TrendFollowingStrategy] = {}
+
+
+def freeze(config: Dict[str, Any]) -> tuple:
+    """Hashable, order-independent form of a (nested) config dict"""
+    return tuple(
+        (key, freeze(value) if isinstance(value, dict) else value)
+        for key, value in sorted(config.items())
+    )
+
+
+def get_strategy(config: Dict[str, Any]) -> TrendFollowingStrategy:
+    """
+    Strategy for config, built once per distinct configuration
+    The instance is shared across test modules: tests that exercise
+    per-instance state (the entry signal cache) should construct their own.
+    """
+    key = freeze(config)
+    strategy = _strategies.get(key)
+    if strategy is None:
+        strategy = _strategies[key] = TrendFollowingStrategy(copy.deepcopy(config))
+    return strategy
@@ -0,0 +1,44 @@
+"""
+Unit tests for the exit condition kernels
+"""
+
+import unittest
+import numpy as np
+from _exits import check_exits, check_exits_batch
+
+
+class TestExitKernels(unittest.TestCase):
+    """Test cases for stop loss / take profit checks"""
+    
+    def test_check_exits_long(self):
+        """Test exits for a long position"""
+        self.assertEqual(tuple(check_exits(94.0, True, 95.0, 110.0)), (True, False))
+        self.assertEqual(tuple(check_exits(111.0, True, 95.0, 110.0)), (False, True))
+        self.assertEqual(tuple(check_exits(100.0, True, 95.0, 110.0)), (False, False))
+    
+    def test_check_exits_short(self):
+        """Test exits for a short position"""
+        self.assertEqual(tuple(check_exits(106.0, False, 105.0, 90.0)), (True, False))
+        self.assertEqual(tuple(check_exits(89.0, False, 105.0, 90.0)), (False, True))
+        self.assertEqual(tuple(check_exits(100.0, False, 105.0, 90.0)), (False, False))
+    
+    def test_batch_matches_scalar(self):
+        """Test the batch kernel agrees with the scalar check"""
+        rng = np.random.default_rng(42)
+        prices = rng.uniform(80, 120, 200)
+        sides = rng.random(200) < 0.5
+        stop_losses = np.where(sides, 95.0, 105.0)
+        take_profits = np.where(sides, 110.0, 90.0)
+        
+        stop_mask, target_mask = check_exits_batch(prices, sides, stop_losses, take_profits)
+        
+        expected = np.array([
+            check_exits(prices[i], sides[i], stop_losses[i], take_profits[i])
+            for i in range(prices.size)
+        ], dtype=bool)
+        self.assertTrue((stop_mask == expected[:, 0]).all())
+        self.assertTrue((target_mask == expected[:, 1]).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
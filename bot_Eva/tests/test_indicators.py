@@ -3,9 +3,15 @@ Unit tests for technical indicators
 """
 
 import unittest
-import pandas as pd
 import numpy as np
-from indicators import TechnicalIndicators
+from indicators import (
+    TechnicalIndicators, TREND_BULL, TREND_BEAR, MACD_BULL, MACD_BEAR,
+    RSI_OVERSOLD, RSI_OVERBOUGHT, VOL_CONF, ADX_TREND
+)
+
+
+START_MS = 1672531200000  # 2023-01-01 00:00 UTC
+BAR_MS = 5 * 60 * 1000    # 5m candles
 
 
 class TestTechnicalIndicators(unittest.TestCase):
@@ -29,74 +35,76 @@ class TestTechnicalIndicators(unittest.TestCase):
         
         # Create sample market data
         np.random.seed(42)  # For reproducible tests
-        dates = pd.date_range('2023-01-01', periods=100, freq='5T')
+        timestamps = START_MS + np.arange(100, dtype=np.int64) * BAR_MS
         
-        # Generate realistic price data
+        # Generate realistic price data (random walk from 50000)
         price_base = 50000
         price_changes = np.random.normal(0, 0.01, 100)
-        prices = [price_base]
+        price_changes[0] = 0
+        prices = price_base * np.cumprod(1 + price_changes)
         
-        for change in price_changes[1:]:
-            new_price = prices[-1] * (1 + change)
-            prices.append(new_price)
+        # High/low offsets drawn together: row 0 for highs, row 1 for lows
+        wicks = np.abs(np.random.normal(0, 0.005, (2, 100)))
         
         self.market_data = {
-            'timestamp': [int(d.timestamp() * 1000) for d in dates],
+            'timestamp': timestamps,
             'open': prices,
-            'high': [p * (1 + abs(np.random.normal(0, 0.005))) for p in prices],
-            'low': [p * (1 - abs(np.random.normal(0, 0.005))) for p in prices],
+            'high': prices * (1 + wicks[0]),
+            'low': prices * (1 - wicks[1]),
             'close': prices,
-            'volume': [np.random.uniform(100, 1000) for _ in range(100)]
+            'volume': np.random.uniform(100, 1000, 100)
         }
     
+    def _reference_ema(self, values, period):
+        """Plain EMA recurrence seeded with the first value"""
+        alpha = 2 / (period + 1)
+        ema = values[0]
+        for value in values[1:]:
+            ema = alpha * value + (1 - alpha) * ema
+        return ema
+    
     def test_calculate_ema(self):
         """Test EMA calculation"""
-        prices = pd.Series(self.market_data['close'])
-        ema = self.indicators.calculate_ema(prices, 20)
+        indicators = self.indicators.calculate_all(self.market_data)
+        expected = self._reference_ema(self.market_data['close'], 20)
         
-        self.assertIsInstance(ema, pd.Series)
-        self.assertEqual(len(ema), len(prices))
-        self.assertFalse(ema.iloc[-1] == 0)  # Should have valid values
+        self.assertAlmostEqual(indicators['ema_200'], expected, places=6)
     
     def test_calculate_macd(self):
         """Test MACD calculation"""
-        prices = pd.Series(self.market_data['close'])
-        macd_data = self.indicators.calculate_macd(prices, 12, 26, 9)
-        
-        self.assertIn('macd', macd_data)
-        self.assertIn('macd_signal', macd_data)
-        self.assertIn('macd_histogram', macd_data)
-        
-        # Check that all series have the same length
-        for key, series in macd_data.items():
-            self.assertEqual(len(series), len(prices))
+        indicators = self.indicators.calculate_all(self.market_data)
+        close = self.market_data['close']
+        expected = self._reference_ema(close, 12) - self._reference_ema(close, 26)
+        
+        self.assertAlmostEqual(indicators['macd'], expected, places=6)
+        self.assertAlmostEqual(
+            indicators['macd_histogram'],
+            indicators['macd'] - indicators['macd_signal'],
+            places=9
+        )
     
     def test_calculate_rsi(self):
         """Test RSI calculation"""
-        prices = pd.Series(self.market_data['close'])
-        rsi = self.indicators.calculate_rsi(prices, 14)
-        
-        self.assertIsInstance(rsi, pd.Series)
-        self.assertEqual(len(rsi), len(prices))
+        rsi = self.indicators.calculate_all(self.market_data)['rsi']
         
         # RSI should be between 0 and 100
-        valid_rsi = rsi.dropna()
-        self.assertTrue(all(0 <= val <= 100 for val in valid_rsi))
+        self.assertTrue(0 <= rsi <= 100)
+        
+        # Only gains -> RSI 100
+        rising = dict(self.market_data, close=np.arange(1.0, 101.0))
+        self.assertEqual(self.indicators.calculate_all(rising)['rsi'], 100.0)
     
     def test_calculate_atr(self):
         """Test ATR calculation"""
-        high = pd.Series(self.market_data['high'])
-        low = pd.Series(self.market_data['low'])
-        close = pd.Series(self.market_data['close'])
-        
-        atr = self.indicators.calculate_atr(high, low, close, 14)
-        
-        self.assertIsInstance(atr, pd.Series)
-        self.assertEqual(len(atr), len(close))
+        atr = self.indicators.calculate_all(self.market_data)['atr']
         
         # ATR should be positive
-        valid_atr = atr.dropna()
-        self.assertTrue(all(val >= 0 for val in valid_atr))
+        self.assertGreater(atr, 0)
+        
+        # Flat closes with a constant 10-point range -> ATR 10
+        flat = dict(self.market_data, high=np.full(100, 105.0), low=np.full(100, 95.0),
+                    close=np.full(100, 100.0))
+        self.assertAlmostEqual(self.indicators.calculate_all(flat)['atr'], 10.0, places=9)
     
     def test_calculate_all(self):
         """Test calculating all indicators at once"""
@@ -111,6 +119,61 @@ class TestTechnicalIndicators(unittest.TestCase):
             self.assertIn(key, indicators)
             self.assertIsNotNone(indicators[key])
     
+    def test_calculate_all_warm_up(self):
+        """Test indicators stay NaN until their window is complete"""
+        short = {key: values[:20] for key, values in self.market_data.items()}
+        indicators = self.indicators.calculate_all(short)
+        
+        self.assertFalse(np.isnan(indicators['ema_200']))
+        self.assertFalse(np.isnan(indicators['volume_ratio']))
+        for key in ('macd', 'macd_signal', 'adx'):
+            self.assertTrue(np.isnan(indicators[key]), key)
+    
+    def test_calculate_series(self):
+        """Test every row of the series equals a full calculation up to that bar"""
+        series = self.indicators.calculate_series(self.market_data)
+        
+        for n in (1, 20, 60, 100):
+            prefix = {key: values[:n] for key, values in self.market_data.items()}
+            expected = self.indicators.calculate_all(prefix)
+            for key, value in expected.items():
+                self.assertEqual(len(series[key]), 100)
+                np.testing.assert_allclose(series[key][n - 1], value, rtol=1e-12, err_msg=key)
+    
+    def test_incremental_matches_full_calculation(self):
+        """Test streaming updates give the same values as a full recalculation"""
+        expected = self.indicators.calculate_all(self.market_data)
+        
+        # Warm up on all but the last bar, then stream the last one in
+        head = {key: values[:-1] for key, values in self.market_data.items()}
+        streaming = TechnicalIndicators(self.config)
+        streaming.calculate_incremental(head)
+        result = streaming.calculate_incremental(self.market_data)
+        
+        for key, value in expected.items():
+            self.assertAlmostEqual(result[key], value, places=6, msg=key)
+    
+    def test_incremental_with_forming_candle(self):
+        """Test the forming candle is previewed without being committed"""
+        streaming = TechnicalIndicators(self.config)
+        data = {key: list(values) for key, values in self.market_data.items()}
+        streaming.calculate_incremental(data, last_bar_open=True)
+        
+        # The forming candle ticks, then closes and a new one opens
+        data['close'][-1] *= 1.01
+        data['high'][-1] = max(data['high'][-1], data['close'][-1])
+        result = streaming.calculate_incremental(data, last_bar_open=True)
+        expected = self.indicators.calculate_all(data)
+        for key, value in expected.items():
+            self.assertAlmostEqual(result[key], value, places=6, msg=key)
+        
+        for key in data:
+            data[key].append(data[key][-1] + (BAR_MS if key == 'timestamp' else 0))
+        result = streaming.calculate_incremental(data, last_bar_open=True)
+        expected = self.indicators.calculate_all(data)
+        for key, value in expected.items():
+            self.assertAlmostEqual(result[key], value, places=6, msg=key)
+    
     def test_trend_detection(self):
         """Test trend detection methods"""
         price = 50000
@@ -162,6 +225,24 @@ class TestTechnicalIndicators(unittest.TestCase):
         self.assertEqual(self.indicators.get_trend_strength(15), "WEAK")
         self.assertEqual(self.indicators.get_trend_strength(35), "MODERATE")
         self.assertEqual(self.indicators.get_trend_strength(65), "STRONG")
+        
+        # Bucket edges belong to the stronger label
+        self.assertEqual(self.indicators.get_trend_strength(25), "MODERATE")
+        self.assertEqual(self.indicators.get_trend_strength(50), "STRONG")
+
+    def test_signal_mask(self):
+        """Test packed signal mask against the individual predicates"""
+        bullish = {'ema_200': 49000, 'macd_histogram': 0.5, 'rsi': 25,
+                   'volume_ratio': 2.0, 'adx': 35}
+        mask = self.indicators.signal_mask(bullish, 50000)
+        self.assertEqual(mask, TREND_BULL | MACD_BULL | RSI_OVERSOLD | VOL_CONF | ADX_TREND)
+
+        bearish = {'ema_200': 51000, 'macd_histogram': -0.5, 'rsi': 75,
+                   'volume_ratio': 1.0, 'adx': 15}
+        mask = self.indicators.signal_mask(bearish, 50000)
+        self.assertEqual(mask, TREND_BEAR | MACD_BEAR | RSI_OVERBOUGHT)
+        self.assertFalse(mask & VOL_CONF)
+        self.assertLess(mask, 256)
 
 
 if __name__ == '__main__':
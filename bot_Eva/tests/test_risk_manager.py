@@ -209,6 +209,41 @@ class TestAdaptiveRiskManager(unittest.TestCase):
         min_notional = 10.0
         actual_notional = risk_params['quantity'] * price
         self.assertGreaterEqual(actual_notional, min_notional)
+    
+    def test_symbol_filters_snap_to_grid(self):
+        """Test prices and quantities land on the exchange tick/step grid"""
+        self.risk_manager.set_symbol_filters(0.01, 0.00001)
+        
+        risk_params = self.risk_manager.calculate_position_size(10000, 50000.123, 500.004)
+        
+        self.assertEqual(risk_params['quantity'], 0.13333)
+        # Distances round up to whole ticks, away from the entry
+        self.assertEqual(risk_params['stop_loss_long'], 49250.11)
+        self.assertEqual(risk_params['take_profit_short'], 48500.1)
+        self.assertEqual(self.risk_manager.get_max_position_size(10000, 30000), 0.01666)
+        
+        position = {'side': 'BUY', 'entry_price': 50000, 'stop_loss': 49000.0}
+        new_stop = self.risk_manager.update_trailing_stop(
+            position, 52000.005, {'atr': 500.003, 'adx': 30}
+        )
+        self.assertEqual(new_stop, 51212.49)
+    
+    def test_symbol_filters_sub_tick_atr(self):
+        """Test stops keep at least one tick when the ATR distance is below the tick size"""
+        self.risk_manager.set_symbol_filters(0.01, 0.00001)
+        
+        risk_params = self.risk_manager.calculate_position_size(10000, 2.5, 0.005)
+        
+        self.assertEqual(risk_params['stop_distance'], 0.01)
+        self.assertEqual(risk_params['stop_loss_long'], 2.49)
+        self.assertEqual(risk_params['take_profit_long'], 2.52)
+        self.assertGreater(risk_params['quantity'], 0)
+        self.assertLessEqual(risk_params['quantity'] * risk_params['stop_distance'],
+                             risk_params['risk_amount'])
+        
+        position = {'side': 'BUY', 'entry_price': 2.0, 'stop_loss': 2.0}
+        new_stop = self.risk_manager.update_trailing_stop(position, 2.5, {'atr': 0.001, 'adx': 25})
+        self.assertEqual(new_stop, 2.49)
 
 
 if __name__ == '__main__':
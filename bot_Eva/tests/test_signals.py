@@ -0,0 +1,49 @@
+"""
+Unit tests for the entry signal kernel
+"""
+
+import unittest
+import numpy as np
+from _signals import (
+    entry_masks, book_depth, ENTRY_ALL, ENTRY_TREND, ENTRY_MACD, ENTRY_RSI, ENTRY_VOLUME, ENTRY_ADX
+)
+
+
+class TestSignalKernel(unittest.TestCase):
+    """Test cases for entry condition masks"""
+    
+    def test_entry_masks(self):
+        """Test condition masks for each direction"""
+        bullish, bearish = entry_masks(50000.0, 48000.0, 0.5, 65.0, 2.0, 1.5, 30.0, 25.0)
+        self.assertEqual(bullish, ENTRY_ALL)
+        self.assertEqual(bearish, ENTRY_RSI | ENTRY_VOLUME | ENTRY_ADX)
+        
+        # Low volume and weak ADX count against both sides
+        bullish, bearish = entry_masks(50000.0, 52000.0, -0.5, 35.0, 1.0, 1.5, 15.0, 25.0)
+        self.assertEqual(bullish, ENTRY_RSI)
+        self.assertEqual(bearish, ENTRY_TREND | ENTRY_MACD | ENTRY_RSI)
+        self.assertEqual(bearish.bit_count(), 3)
+    
+    def test_entry_masks_warm_up(self):
+        """Test NaN indicators never complete a signal"""
+        bullish, bearish = entry_masks(50000.0, np.nan, 0.5, 65.0, 2.0, 1.5, 30.0, 25.0)
+        self.assertNotEqual(bullish, ENTRY_ALL)
+        self.assertNotEqual(bearish, ENTRY_ALL)
+    
+    def test_book_depth_numeric_equivalence(self):
+        """Test the depth reducer against a plain Python sum"""
+        rng = np.random.default_rng(3)
+        for depth, levels in ((5, 5), (20, 5), (100, 50), (3, 10)):
+            bids = rng.uniform(0.001, 5.0, depth)
+            asks = rng.uniform(0.001, 5.0, depth)
+            
+            bid_volume, ask_volume = book_depth(bids, asks, levels)
+            
+            np.testing.assert_allclose(bid_volume, sum(bids.tolist()[:levels]), rtol=1e-12)
+            np.testing.assert_allclose(ask_volume, sum(asks.tolist()[:levels]), rtol=1e-12)
+        
+        self.assertEqual(book_depth(np.empty(0), np.empty(0), 5), (0.0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+"""
+Unit tests for request signing
+"""
+
+import hashlib
+import hmac
+import unittest
+from _signing import sign_query
+
+
+class TestSignQuery(unittest.TestCase):
+    """Test cases for signed query strings"""
+    
+    def setUp(self):
+        """Set up a keyed HMAC template"""
+        self.secret = b'test-secret'
+        self.template = hmac.new(self.secret, digestmod=hashlib.sha256)
+    
+    def test_signature_matches_query(self):
+        """Test the appended signature is the HMAC of the filled template"""
+        signed = sign_query(self.template, 'symbol=BTCUSDT&side=%s&quantity=%s&timestamp=%d',
+                            ('BUY', '0.01000'))
+        query, signature = signed.rsplit('&signature=', 1)
+        
+        self.assertTrue(query.startswith('symbol=BTCUSDT&side=BUY&quantity=0.01000&timestamp='))
+        self.assertEqual(signature, hmac.new(self.secret, query.encode(), hashlib.sha256).hexdigest())
+    
+    def test_template_is_not_consumed(self):
+        """Test the cached HMAC state is reused unchanged across calls"""
+        first = sign_query(self.template, 'timestamp=%d', ())
+        second = sign_query(self.template, 'timestamp=%d', ())
+        
+        for signed in (first, second):
+            query, signature = signed.rsplit('&signature=', 1)
+            self.assertEqual(signature, hmac.new(self.secret, query.encode(), hashlib.sha256).hexdigest())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,16 +3,78 @@ Unit tests for trading strategy
 """
 
 import unittest
-from unittest.mock import Mock, patch
-from strategy import TrendFollowingStrategy
+from types import MappingProxyType
+from unittest.mock import patch
+import numpy as np
+from strategy import TrendFollowingStrategy, ExitReason
+from _signals import entry_actions_batch
+from _fixtures import get_strategy, OB_BUY_HEAVY, OB_SELL_HEAVY, OB_THIN_BIDS
+
+
+# Read-only fixtures shared by every test
+_CLOSE_UP = np.array([49000, 49500, 50000, 50500, 51000], dtype=np.float64)
+_CLOSE_DOWN = _CLOSE_UP[::-1].copy()
+_CLOSE_UP.flags.writeable = _CLOSE_DOWN.flags.writeable = False
+
+_MARKET_DATA = MappingProxyType({
+    'close': _CLOSE_UP
+})
+
+# Sample indicators for bullish scenario
+_BULLISH = MappingProxyType({
+    'ema_200': 48000,
+    'macd_histogram': 0.5,
+    'rsi': 65,
+    'volume_ratio': 2.0,
+    'adx': 30
+})
+
+# Sample indicators for bearish scenario
+_BEARISH = MappingProxyType({
+    'ema_200': 52000,
+    'macd_histogram': -0.5,
+    'rsi': 35,
+    'volume_ratio': 2.0,
+    'adx': 30
+})
+
+# Open positions checked by the exit tests
+_LONG = MappingProxyType({'side': 'BUY', 'entry_price': 50000.0})
+_SHORT = MappingProxyType({'side': 'SELL', 'entry_price': 50000.0})
+
+# (name, indicators, expected action) for get_entry_signal on _MARKET_DATA
+ENTRY_CASES = (
+    ('bullish', _BULLISH, 'BUY'),
+    ('bearish', _BEARISH, 'SELL'),
+    ('mixed', {**_BULLISH, 'macd_histogram': -0.5}, 'NONE'),     # Bullish trend, bearish MACD
+    ('low volume', {**_BULLISH, 'volume_ratio': 1.0}, 'NONE'),   # Below threshold
+    ('weak trend', {**_BULLISH, 'adx': 15}, 'NONE'),             # Below threshold
+)
+
+# (name, position, closes, indicators, expected reason code)
+EXIT_CASES = (
+    # Price below EMA, bearish momentum, overbought
+    ('long reversal', _LONG, _CLOSE_DOWN,
+     {'ema_200': 52000, 'macd_histogram': -0.5, 'rsi': 75, 'adx': 30}, ExitReason.TREND_REVERSAL),
+    # Price above EMA, bullish momentum, oversold
+    ('short reversal', _SHORT, _MARKET_DATA['close'],
+     {'ema_200': 48000, 'macd_histogram': 0.5, 'rsi': 25, 'adx': 30}, ExitReason.TREND_REVERSAL),
+    # ADX below the exit threshold
+    ('weak trend', _LONG, _MARKET_DATA['close'],
+     {'ema_200': 48000, 'macd_histogram': 0.1, 'rsi': 50, 'adx': 15}, ExitReason.WEAK_TREND),
+    # Bullish trend continues, not overbought, strong trend
+    ('favorable', _LONG, _MARKET_DATA['close'],
+     {'ema_200': 48000, 'macd_histogram': 0.3, 'rsi': 60, 'adx': 35}, ExitReason.NONE),
+)
 
 
 class TestTrendFollowingStrategy(unittest.TestCase):
     """Test cases for trading strategy"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.config = {
+    @classmethod
+    def setUpClass(cls):
+        """Set up the configuration and strategy shared by every test"""
+        cls.config = {
             'trading': {
                 'symbol': 'BTCUSDT',
                 'risk_per_trade': 0.01
@@ -28,203 +90,167 @@ class TestTrendFollowingStrategy(unittest.TestCase):
             }
         }
         
-        self.strategy = TrendFollowingStrategy(self.config)
-        
-        # Sample market data
-        self.market_data = {
-            'close': [49000, 49500, 50000, 50500, 51000]
-        }
-        
-        # Sample indicators for bullish scenario
-        self.bullish_indicators = {
-            'ema_200': 48000,
-            'macd_histogram': 0.5,
-            'rsi': 65,
-            'volume_ratio': 2.0,
-            'adx': 30
-        }
-        
-        # Sample indicators for bearish scenario
-        self.bearish_indicators = {
-            'ema_200': 52000,
-            'macd_histogram': -0.5,
-            'rsi': 35,
-            'volume_ratio': 2.0,
-            'adx': 30
-        }
+        cls.strategy = get_strategy(cls.config)
     
-    def test_bullish_entry_signal(self):
-        """Test bullish entry signal generation"""
-        signal = self.strategy.get_entry_signal(self.market_data, self.bullish_indicators)
-        
-        self.assertEqual(signal['action'], 'BUY')
-        self.assertEqual(signal['confidence'], 1.0)  # All conditions met
-        self.assertIn('reasons', signal)
-        self.assertGreater(len(signal['reasons']), 0)
+    def test_entry_signals(self):
+        """Test entry signal generation for each scenario"""
+        for name, indicators, expected_action in ENTRY_CASES:
+            with self.subTest(name=name):
+                signal = self.strategy.get_entry_signal(_MARKET_DATA, indicators)
+                
+                self.assertEqual(signal['action'], expected_action)
+                if expected_action == 'NONE':
+                    self.assertLess(signal['confidence'], 1.0)
+                else:
+                    self.assertEqual(signal['confidence'], 1.0)  # All conditions met
+                    self.assertGreater(len(signal['reasons']), 0)
     
-    def test_bearish_entry_signal(self):
-        """Test bearish entry signal generation"""
-        signal = self.strategy.get_entry_signal(self.market_data, self.bearish_indicators)
+    def test_entry_signal_cached_within_bar(self):
+        """Test repeated calls for an unchanged bar reuse the last signal"""
+        strategy = TrendFollowingStrategy(self.config)  # own signal cache
+        market_data = dict(_MARKET_DATA, timestamp=[0, 300000, 600000, 900000, 1200000])
+        first = strategy.get_entry_signal(market_data, _BULLISH)
+        
+        with patch.object(strategy, '_evaluate_signals') as evaluate:
+            again = strategy.get_entry_signal(market_data, _BULLISH)
+            evaluate.assert_not_called()
+        self.assertEqual(again, first)
         
-        self.assertEqual(signal['action'], 'SELL')
-        self.assertEqual(signal['confidence'], 1.0)  # All conditions met
-        self.assertIn('reasons', signal)
-        self.assertGreater(len(signal['reasons']), 0)
+        # Each caller owns its result: annotating one leaves the cache intact
+        self.assertIsNot(again, first)
+        first['reasons'].append('annotated')
+        again['action'] = 'NONE'
+        cached = strategy.get_entry_signal(market_data, _BULLISH)
+        self.assertEqual(cached['action'], 'BUY')
+        self.assertNotIn('annotated', cached['reasons'])
+        
+        # A new indicator value on the same bar is evaluated again
+        changed = {**_BULLISH, 'rsi': 75}
+        signal = strategy.get_entry_signal(market_data, changed)
+        self.assertEqual(signal['action'], 'NONE')
     
-    def test_no_signal_mixed_conditions(self):
-        """Test no signal when conditions are mixed"""
-        mixed_indicators = {
-            'ema_200': 48000,  # Bullish
-            'macd_histogram': -0.5,  # Bearish
-            'rsi': 65,
-            'volume_ratio': 2.0,
-            'adx': 30
+    def test_entry_signal_vectorized(self):
+        """Test one batch call decides every bar (1 BUY, -1 SELL, 0 NONE)"""
+        close = np.array([50000.0, 50000.0, 50000.0])
+        indicators = {
+            'ema_200': np.array([48000.0, 52000.0, 50000.0]),
+            'macd_histogram': np.array([0.5, -0.5, 0.0]),
+            'rsi': np.array([65.0, 35.0, 50.0]),
+            'volume_ratio': np.array([2.0, 2.0, 2.0]),
+            'adx': np.array([30.0, 30.0, 30.0])
         }
         
-        signal = self.strategy.get_entry_signal(self.market_data, mixed_indicators)
+        actions = self.strategy.get_entry_signals_batch({'close': close}, indicators)
         
-        self.assertEqual(signal['action'], 'NONE')
-        self.assertLess(signal['confidence'], 1.0)
+        np.testing.assert_array_equal(actions, np.array([1, -1, 0], dtype=np.int8))
     
-    def test_no_signal_low_volume(self):
-        """Test no signal when volume is insufficient"""
-        low_volume_indicators = self.bullish_indicators.copy()
-        low_volume_indicators['volume_ratio'] = 1.0  # Below threshold
+    def test_entry_signals_batch_zero_copy(self):
+        """Test float64 columns reach the batch kernel without a copy"""
+        indicators = {
+            'ema_200': np.full(5, 48000.0),
+            'macd_histogram': np.full(5, 0.5),
+            'rsi': np.full(5, 65.0),
+            'volume_ratio': np.full(5, 2.0),
+            'adx': np.full(5, 30.0)
+        }
         
-        signal = self.strategy.get_entry_signal(self.market_data, low_volume_indicators)
+        with patch('strategy.entry_actions_batch', wraps=entry_actions_batch) as kernel:
+            actions = self.strategy.get_entry_signals_batch(_MARKET_DATA, indicators)
         
-        self.assertEqual(signal['action'], 'NONE')
+        args = kernel.call_args.args
+        self.assertIs(args[0], _CLOSE_UP)
+        self.assertIs(args[1], indicators['ema_200'])
+        self.assertTrue((actions == 1).all())
     
-    def test_no_signal_weak_trend(self):
-        """Test no signal when trend is weak (low ADX)"""
-        weak_trend_indicators = self.bullish_indicators.copy()
-        weak_trend_indicators['adx'] = 15  # Below threshold
+    def test_entry_signals_batch_matches_single(self):
+        """Test batch entry actions agree with the per-bar signal"""
+        rng = np.random.default_rng(7)
+        n = 500
+        close = rng.uniform(49000, 51000, n)
+        indicators = {
+            'ema_200': np.full(n, 50000.0),
+            'macd_histogram': rng.normal(0, 1, n),
+            'rsi': rng.uniform(10, 90, n),
+            'volume_ratio': rng.uniform(0.5, 3.0, n),
+            'adx': rng.uniform(10, 50, n)
+        }
+        indicators['rsi'][:10] = np.nan  # still warming up
         
-        signal = self.strategy.get_entry_signal(self.market_data, weak_trend_indicators)
+        actions = self.strategy.get_entry_signals_batch({'close': close}, indicators)
         
-        self.assertEqual(signal['action'], 'NONE')
+        self.assertEqual(actions.dtype, np.int8)
+        codes = {'BUY': 1, 'SELL': -1, 'NONE': 0}
+        expected = [
+            codes[self.strategy.get_entry_signal(
+                {'close': close[:i + 1]}, {key: values[i] for key, values in indicators.items()}
+            )['action']]
+            for i in range(n)
+        ]
+        self.assertEqual(actions.tolist(), expected)
+        self.assertTrue((actions[:10] == 0).all())
+        self.assertTrue((actions != 0).any())
     
     def test_orderbook_validation_buy(self):
         """Test order book validation for buy orders"""
-        orderbook = {
-            'bids': [['50000', '1.0'], ['49950', '0.5'], ['49900', '0.3']],
-            'asks': [['50050', '0.5'], ['50100', '0.3'], ['50150', '0.2']]
-        }
-        
         # More bid volume than ask volume - should validate buy
-        result = self.strategy.validate_orderbook_pressure(orderbook, 'BUY')
+        result = self.strategy.validate_orderbook_pressure(OB_BUY_HEAVY, 'BUY')
         self.assertTrue(result)
     
     def test_orderbook_validation_sell(self):
         """Test order book validation for sell orders"""
-        orderbook = {
-            'bids': [['50000', '0.3'], ['49950', '0.2'], ['49900', '0.1']],
-            'asks': [['50050', '1.0'], ['50100', '0.8'], ['50150', '0.5']]
-        }
-        
         # More ask volume than bid volume - should validate sell
-        result = self.strategy.validate_orderbook_pressure(orderbook, 'SELL')
+        result = self.strategy.validate_orderbook_pressure(OB_SELL_HEAVY, 'SELL')
         self.assertTrue(result)
     
     def test_orderbook_validation_insufficient_pressure(self):
         """Test order book validation with insufficient pressure"""
-        orderbook = {
-            'bids': [['50000', '1.0'], ['49950', '0.5']],
-            'asks': [['50050', '1.2'], ['50100', '0.8']]
-        }
-        
         # More ask volume - should not validate buy
-        result = self.strategy.validate_orderbook_pressure(orderbook, 'BUY')
+        result = self.strategy.validate_orderbook_pressure(OB_THIN_BIDS, 'BUY')
         self.assertFalse(result)
     
-    def test_exit_signal_trend_reversal_long(self):
-        """Test exit signal for long position on trend reversal"""
-        position = {
-            'side': 'BUY',
-            'entry_price': 50000
+    def test_orderbook_validation_numeric_levels(self):
+        """Test order book validation with already parsed (float) levels"""
+        parsed = {
+            side: tuple((float(price), float(qty)) for price, qty in OB_BUY_HEAVY[side])
+            for side in ('bids', 'asks')
         }
         
-        # Bearish reversal indicators
-        reversal_indicators = {
-            'ema_200': 52000,  # Price below EMA
-            'macd_histogram': -0.5,  # Bearish momentum
-            'rsi': 75,  # Overbought
-            'adx': 30
-        }
-        
-        # Current price below EMA
-        reversal_market_data = {
-            'close': [51000, 50500, 50000, 49500, 49000]
-        }
-        
-        exit_signal = self.strategy.get_exit_signal(
-            reversal_market_data, reversal_indicators, position
-        )
-        
-        self.assertTrue(exit_signal['should_exit'])
-        self.assertIn('reversal', exit_signal['reason'].lower())
+        self.assertTrue(self.strategy.validate_orderbook_pressure(parsed, 'BUY'))
+        self.assertFalse(self.strategy.validate_orderbook_pressure(parsed, 'SELL'))
     
-    def test_exit_signal_trend_reversal_short(self):
-        """Test exit signal for short position on trend reversal"""
-        position = {
-            'side': 'SELL',
-            'entry_price': 50000
-        }
-        
-        # Bullish reversal indicators
-        reversal_indicators = {
-            'ema_200': 48000,  # Price above EMA
-            'macd_histogram': 0.5,  # Bullish momentum
-            'rsi': 25,  # Oversold
-            'adx': 30
-        }
-        
-        # Current price above EMA
-        reversal_market_data = {
-            'close': [49000, 49500, 50000, 50500, 51000]
+    def test_orderbook_validation_deep_book(self):
+        """Test order book validation past the small-book fast path"""
+        strategy = TrendFollowingStrategy(dict(self.config, execution={'orderbook_levels': 20}))
+        orderbook = {
+            'bids': [[str(50000 - i), '0.4'] for i in range(20)],
+            'asks': [[str(50001 + i), '0.5'] for i in range(5)] +
+                    [[str(50006 + i), '0.3'] for i in range(15)]
         }
         
-        exit_signal = self.strategy.get_exit_signal(
-            reversal_market_data, reversal_indicators, position
-        )
-        
-        self.assertTrue(exit_signal['should_exit'])
-        self.assertIn('reversal', exit_signal['reason'].lower())
+        # 8.0 bid vs 7.0 ask over 20 levels; asks lead within the top 5
+        self.assertTrue(strategy.validate_orderbook_pressure(orderbook, 'BUY'))
+        self.assertFalse(self.strategy.validate_orderbook_pressure(orderbook, 'BUY'))
     
-    def test_exit_signal_weak_trend(self):
-        """Test exit signal on weak trend (low ADX)"""
-        position = {'side': 'BUY', 'entry_price': 50000}
-        
-        weak_trend_indicators = {
-            'ema_200': 48000,
-            'macd_histogram': 0.1,
-            'rsi': 50,
-            'adx': 15  # Below threshold
+    def test_orderbook_validation_columnar(self):
+        """Test order book validation with columnar (array) order book"""
+        orderbook = {
+            'bids_price': np.array([50000.0, 49950.0, 49900.0]),
+            'bids_qty': np.array([1.0, 0.5, 0.3]),
+            'asks_price': np.array([50050.0, 50100.0, 50150.0]),
+            'asks_qty': np.array([0.5, 0.3, 0.2])
         }
         
-        exit_signal = self.strategy.get_exit_signal(
-            self.market_data, weak_trend_indicators, position
-        )
-        
-        self.assertTrue(exit_signal['should_exit'])
-        self.assertIn('weak trend', exit_signal['reason'].lower())
+        self.assertTrue(self.strategy.validate_orderbook_pressure(orderbook, 'BUY'))
+        self.assertFalse(self.strategy.validate_orderbook_pressure(orderbook, 'SELL'))
     
-    def test_no_exit_signal(self):
-        """Test no exit signal when conditions are favorable"""
-        position = {'side': 'BUY', 'entry_price': 50000}
-        
-        favorable_indicators = {
-            'ema_200': 48000,  # Bullish trend continues
-            'macd_histogram': 0.3,  # Still bullish
-            'rsi': 60,  # Not overbought
-            'adx': 35  # Strong trend
-        }
-        
-        exit_signal = self.strategy.get_exit_signal(
-            self.market_data, favorable_indicators, position
-        )
-        
-        self.assertFalse(exit_signal['should_exit'])
+    def test_exit_signals(self):
+        """Test strategy-based exits for each scenario"""
+        for name, position, closes, indicators, reason_code in EXIT_CASES:
+            with self.subTest(name=name):
+                exit_signal = self.strategy.get_exit_signal({'close': closes}, indicators, position)
+                
+                self.assertIs(exit_signal['reason_code'], reason_code)
+                self.assertEqual(exit_signal['should_exit'], reason_code is not ExitReason.NONE)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,51 @@
+"""
+Benchmarks for the order book pressure check
+Needs pytest-benchmark; the module is skipped when the plugin is missing
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from _fixtures import get_strategy, OB_BUY_HEAVY
+from _signals import book_depth
+
+
+_CONFIG = {
+    'indicators': {'volume_multiplier': 1.5},
+    'risk_management': {'min_adx_for_trend': 25},
+    'execution': {'orderbook_levels': 5}
+}
+
+# Executor shape: float64 columns, 20 levels deep
+_OB_COLUMNAR = {
+    'bids_price': 50000.0 - np.arange(20.0),
+    'bids_qty': np.full(20, 0.5),
+    'asks_price': 50001.0 + np.arange(20.0),
+    'asks_qty': np.full(20, 0.4)
+}
+
+
+@pytest.fixture(scope='module')
+def strategy():
+    """Strategy shared by every benchmark"""
+    return get_strategy(_CONFIG)
+
+
+def test_ob_pressure_raw_bench(benchmark, strategy):
+    """Pressure check on the raw exchange shape"""
+    assert benchmark(strategy.validate_orderbook_pressure, OB_BUY_HEAVY, 'BUY')
+
+
+def test_ob_pressure_columnar_bench(benchmark, strategy):
+    """Pressure check on the columnar shape"""
+    assert benchmark(strategy.validate_orderbook_pressure, _OB_COLUMNAR, 'BUY')
+
+
+def test_book_depth_bench(benchmark):
+    """Depth reducer on its own"""
+    book_depth(_OB_COLUMNAR['bids_qty'], _OB_COLUMNAR['asks_qty'], 5)  # compile first
+    bid_volume, ask_volume = benchmark(
+        book_depth, _OB_COLUMNAR['bids_qty'], _OB_COLUMNAR['asks_qty'], 5)
+    assert bid_volume > ask_volume
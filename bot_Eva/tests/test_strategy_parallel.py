@@ -0,0 +1,56 @@
+"""
+Unit tests for parallel backtests
+"""
+
+import unittest
+import numpy as np
+from strategy_parallel import backtest_all, backtest_symbol
+
+
+class TestParallelBacktest(unittest.TestCase):
+    """Test cases for multi-symbol backtests"""
+    
+    def setUp(self):
+        """Set up configuration and per-symbol histories"""
+        self.config = {
+            'indicators': {
+                'ema_period': 50, 'macd_fast': 12, 'macd_slow': 26, 'macd_signal': 9,
+                'rsi_period': 14, 'atr_period': 14, 'volume_period': 20,
+                'volume_multiplier': 1.2, 'adx_period': 14
+            },
+            'risk_management': {'min_adx_for_trend': 20},
+            'execution': {'orderbook_levels': 5}
+        }
+        
+        rng = np.random.default_rng(3)
+        self.data_map = {}
+        for symbol in ('BTCUSDT', 'ETHUSDT', 'BNBUSDT'):
+            close = 1000 * np.cumprod(1 + rng.normal(0, 0.01, 400))
+            self.data_map[symbol] = {
+                'high': close * 1.004,
+                'low': close * 0.996,
+                'close': close,
+                'volume': rng.uniform(100, 1000, 400)
+            }
+    
+    def test_backtest_symbol(self):
+        """Test a single-symbol backtest summary"""
+        result = backtest_symbol(self.data_map['BTCUSDT'], self.config)
+        
+        self.assertEqual(result['bars'], 400)
+        self.assertEqual(result['actions'].dtype, np.int8)
+        self.assertEqual(result['buy_signals'], int((result['actions'] == 1).sum()))
+        self.assertFalse(result['actions'][:26].any())  # MACD still warming up
+    
+    def test_backtest_all_matches_sequential(self):
+        """Test worker processes give the same result as in-process runs"""
+        results = dict(backtest_all(self.data_map, self.config, max_workers=2))
+        
+        self.assertEqual(set(results), set(self.data_map))
+        for symbol, market_data in self.data_map.items():
+            expected = backtest_symbol(market_data, self.config)
+            np.testing.assert_array_equal(results[symbol]['actions'], expected['actions'])
+
+
+if __name__ == '__main__':
+    unittest.main()
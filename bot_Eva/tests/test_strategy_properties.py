@@ -0,0 +1,73 @@
+"""
+Property-based tests for the order book pressure check
+Needs hypothesis; the module is skipped when it is missing
+"""
+
+import unittest
+from decimal import Decimal
+import numpy as np
+import pytest
+
+pytest.importorskip('hypothesis')
+from hypothesis import assume, given, strategies as st
+
+from _fixtures import get_strategy
+
+
+# Exchange-shape level: [price, qty] as strings
+_LEVEL = st.tuples(
+    st.decimals(min_value=1, max_value=1_000_000, places=2).map(str),
+    st.decimals(min_value=0, max_value=100, places=4).map(str)
+)
+_SIDE = st.lists(_LEVEL, max_size=12)
+
+
+class TestOrderbookPressureProperties(unittest.TestCase):
+    """Pressure check against an exact sum of the top levels"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up the strategy shared by every example"""
+        cls.levels = 5
+        cls.strategy = get_strategy({
+            'indicators': {'volume_multiplier': 1.5},
+            'risk_management': {'min_adx_for_trend': 25},
+            'execution': {'orderbook_levels': cls.levels}
+        })
+    
+    def _totals(self, bids, asks):
+        """Exact bid and ask quantity over the configured depth"""
+        bid_total = sum(Decimal(qty) for _, qty in bids[:self.levels])
+        ask_total = sum(Decimal(qty) for _, qty in asks[:self.levels])
+        assume(bid_total != ask_total)  # float sums may break an exact tie either way
+        return bid_total, ask_total
+    
+    @given(bids=_SIDE, asks=_SIDE)
+    def test_raw_book_pressure(self, bids, asks):
+        """Test the raw exchange shape follows the heavier side"""
+        bid_total, ask_total = self._totals(bids, asks)
+        orderbook = {'bids': bids, 'asks': asks}
+        
+        self.assertEqual(self.strategy.validate_orderbook_pressure(orderbook, 'BUY'),
+                         bid_total > ask_total)
+        self.assertEqual(self.strategy.validate_orderbook_pressure(orderbook, 'SELL'),
+                         ask_total > bid_total)
+    
+    @given(bids=_SIDE, asks=_SIDE)
+    def test_columnar_book_pressure(self, bids, asks):
+        """Test the columnar shape agrees with the raw one"""
+        bid_total, ask_total = self._totals(bids, asks)
+        orderbook = {
+            f'{side}_{column}': np.array([float(level[i]) for level in levels], dtype=np.float64)
+            for side, levels in (('bids', bids), ('asks', asks))
+            for i, column in enumerate(('price', 'qty'))
+        }
+        
+        self.assertEqual(self.strategy.validate_orderbook_pressure(orderbook, 'BUY'),
+                         bid_total > ask_total)
+        self.assertEqual(self.strategy.validate_orderbook_pressure(orderbook, 'SELL'),
+                         ask_total > bid_total)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,20 +4,30 @@ Common utility functions used across the trading bot
 """
 
 import os
+import shutil
 import yaml
 import json
 import logging
 import asyncio
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
-import hashlib
+import time
+from collections import deque
+from typing import Dict, Any, Iterable, Iterator, List
+from datetime import datetime
+import secrets
+
+import numpy as np
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
 
 
 def load_config(config_path: str) -> Dict[str, Any]:
     """Load configuration from YAML file"""
     try:
-        with open(config_path, 'r') as file:
-            config = yaml.safe_load(file)
+        with open(config_path, 'rb') as file:
+            config = yaml.load(file, Loader=YamlLoader)
         
         # Override with environment variables if available
         config = _override_with_env_vars(config)
@@ -36,111 +46,112 @@ def load_config(config_path: str) -> Dict[str, Any]:
         raise
 
 
+# Environment variables copied verbatim into config (section, key)
+_ENV_MAP = (
+    ('BINANCE_API_KEY', ('api', 'binance_api_key')),
+    ('BINANCE_SECRET_KEY', ('api', 'binance_secret_key')),
+    ('TELEGRAM_BOT_TOKEN', ('telegram', 'bot_token')),
+    ('TELEGRAM_CHAT_ID', ('telegram', 'chat_id')),
+    ('TRADING_SYMBOL', ('trading', 'symbol')),
+)
+
+
 def _override_with_env_vars(config: Dict[str, Any]) -> Dict[str, Any]:
     """Override configuration with environment variables"""
+    environ = os.environ
     
-    # API credentials
-    if os.getenv('BINANCE_API_KEY'):
-        config['api']['binance_api_key'] = os.getenv('BINANCE_API_KEY')
-    
-    if os.getenv('BINANCE_SECRET_KEY'):
-        config['api']['binance_secret_key'] = os.getenv('BINANCE_SECRET_KEY')
-    
-    # Telegram credentials
-    if os.getenv('TELEGRAM_BOT_TOKEN'):
-        config['telegram']['bot_token'] = os.getenv('TELEGRAM_BOT_TOKEN')
-    
-    if os.getenv('TELEGRAM_CHAT_ID'):
-        config['telegram']['chat_id'] = os.getenv('TELEGRAM_CHAT_ID')
-    
-    # Trading symbol
-    if os.getenv('TRADING_SYMBOL'):
-        config['trading']['symbol'] = os.getenv('TRADING_SYMBOL')
+    # API/Telegram credentials and trading symbol (empty values are ignored)
+    for env_name, (section, key) in _ENV_MAP:
+        value = environ.get(env_name)
+        if value:
+            config[section][key] = value
     
     # Risk percentage
-    if os.getenv('RISK_PER_TRADE'):
+    risk_value = environ.get('RISK_PER_TRADE')
+    if risk_value:
         try:
-            risk_value = os.getenv('RISK_PER_TRADE')
-            if risk_value:
-                config['trading']['risk_per_trade'] = float(risk_value)
+            config['trading']['risk_per_trade'] = float(risk_value)
         except ValueError:
             logging.warning("Invalid RISK_PER_TRADE environment variable")
     
     return config
 
 
+_REQUIRED_SECTIONS = ('api', 'trading', 'indicators', 'risk_management', 'execution')
+
+# (section, key, check, error message) for every validated parameter
+_CONFIG_RULES = (
+    ('trading', 'risk_per_trade', lambda v: 0 < v <= 0.1,
+     "risk_per_trade must be between 0 and 0.1 (10%)"),
+    ('trading', 'risk_reward_ratio', lambda v: v >= 1,
+     "risk_reward_ratio must be >= 1"),
+) + tuple(
+    ('indicators', name, lambda v: v > 0, f"Invalid indicator parameter: {name}")
+    for name in ('ema_period', 'macd_fast', 'macd_slow', 'rsi_period', 'atr_period')
+)
+
+
 def validate_config(config: Dict[str, Any]) -> bool:
     """Validate configuration parameters"""
-    required_sections = ['api', 'trading', 'indicators', 'risk_management', 'execution']
-    
-    for section in required_sections:
+    for section in _REQUIRED_SECTIONS:
         if section not in config:
             raise ValueError(f"Missing required configuration section: {section}")
     
-    # Validate trading parameters
-    trading_config = config['trading']
-    if trading_config['risk_per_trade'] <= 0 or trading_config['risk_per_trade'] > 0.1:
-        raise ValueError("risk_per_trade must be between 0 and 0.1 (10%)")
-    
-    if trading_config['risk_reward_ratio'] < 1:
-        raise ValueError("risk_reward_ratio must be >= 1")
-    
-    # Validate indicator parameters
-    indicators_config = config['indicators']
-    required_indicators = ['ema_period', 'macd_fast', 'macd_slow', 'rsi_period', 'atr_period']
-    
-    for indicator in required_indicators:
-        if indicator not in indicators_config or indicators_config[indicator] <= 0:
-            raise ValueError(f"Invalid indicator parameter: {indicator}")
+    # Missing or non-numeric values fail the same way as out-of-range ones
+    for section, key, check, message in _CONFIG_RULES:
+        value = config[section].get(key)
+        try:
+            valid = value is not None and check(value)
+        except TypeError:
+            valid = False
+        if not valid:
+            raise ValueError(message)
     
     logging.info("Configuration validation passed")
     return True
 
 
-def calculate_portfolio_metrics(trades: List[Dict[str, Any]]) -> Dict[str, float]:
-    """Calculate portfolio performance metrics"""
-    if not trades:
+def calculate_portfolio_metrics(trades: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Calculate portfolio performance metrics
+    Accepts any iterable of trades (e.g. iter_trade_history()); only the PnL
+    column is kept in memory.
+    """
+    # Single pass over the history, every metric is a vectorized reduction
+    pnls = np.fromiter((t.get('pnl', 0) for t in trades), dtype=np.float64)
+    total_trades = len(pnls)
+    if not total_trades:
         return {}
     
-    # Calculate basic metrics
-    total_trades = len(trades)
-    winning_trades = [t for t in trades if t.get('pnl', 0) > 0]
-    losing_trades = [t for t in trades if t.get('pnl', 0) < 0]
-    
-    win_rate = (len(winning_trades) / total_trades) * 100 if total_trades > 0 else 0
+    wins = pnls[pnls > 0]
+    losses = pnls[pnls < 0]
+    win_sum = wins.sum()
+    loss_sum = losses.sum()
     
-    total_pnl = sum(t.get('pnl', 0) for t in trades)
-    average_win = sum(t.get('pnl', 0) for t in winning_trades) / len(winning_trades) if winning_trades else 0
-    average_loss = sum(t.get('pnl', 0) for t in losing_trades) / len(losing_trades) if losing_trades else 0
+    win_rate = (len(wins) / total_trades) * 100
+    average_win = win_sum / len(wins) if len(wins) else 0
+    average_loss = loss_sum / len(losses) if len(losses) else 0
     
     # Risk metrics
-    profit_factor = abs(sum(t.get('pnl', 0) for t in winning_trades) / sum(t.get('pnl', 0) for t in losing_trades)) if losing_trades else float('inf')
-    
-    # Drawdown calculation
-    running_pnl = 0
-    peak = 0
-    max_drawdown = 0
+    profit_factor = abs(win_sum / loss_sum) if len(losses) else float('inf')
     
-    for trade in trades:
-        running_pnl += trade.get('pnl', 0)
-        if running_pnl > peak:
-            peak = running_pnl
-        drawdown = peak - running_pnl
-        if drawdown > max_drawdown:
-            max_drawdown = drawdown
+    # Drawdown from the running peak of cumulative PnL (peak starts at 0)
+    running_pnl = np.cumsum(pnls)
+    peak = np.maximum(np.maximum.accumulate(running_pnl), 0)
+    max_drawdown = (peak - running_pnl).max()
     
     return {
         'total_trades': total_trades,
-        'winning_trades': len(winning_trades),
-        'losing_trades': len(losing_trades),
-        'win_rate': win_rate,
-        'total_pnl': total_pnl,
-        'average_win': average_win,
-        'average_loss': average_loss,
-        'profit_factor': profit_factor,
-        'max_drawdown': max_drawdown,
-        'best_trade': max((t.get('pnl', 0) for t in trades), default=0),
-        'worst_trade': min((t.get('pnl', 0) for t in trades), default=0)
+        'winning_trades': len(wins),
+        'losing_trades': len(losses),
+        'win_rate': float(win_rate),
+        'total_pnl': float(pnls.sum()),
+        'average_win': float(average_win),
+        'average_loss': float(average_loss),
+        'profit_factor': float(profit_factor),
+        'max_drawdown': float(max_drawdown),
+        'best_trade': float(pnls.max()),
+        'worst_trade': float(pnls.min())
     }
 
 
@@ -154,6 +165,11 @@ def format_percentage(value: float, decimals: int = 2) -> str:
     return f"{value:.{decimals}f}%"
 
 
+def step_decimals(step: float | str) -> int:
+    """Decimals needed to print multiples of a tick/step size (e.g. 0.01 -> 2)"""
+    return len(f"{float(step):.8f}".rstrip('0').partition('.')[2])
+
+
 def calculate_time_difference(start_time: datetime, end_time: datetime | None = None) -> str:
     """Calculate human-readable time difference"""
     if end_time is None:
@@ -175,30 +191,20 @@ def calculate_time_difference(start_time: datetime, end_time: datetime | None =
 
 def generate_trade_id() -> str:
     """Generate unique trade ID"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    random_hash = hashlib.md5(str(datetime.now().timestamp()).encode()).hexdigest()[:6]
-    return f"TRADE_{timestamp}_{random_hash}"
+    return f"TRADE_{datetime.now():%Y%m%d_%H%M%S}_{secrets.token_hex(3)}"
 
 
-def save_trade_history(trade_data: Dict[str, Any], file_path: str = "data/trade_history.json"):
-    """Save trade to history file"""
+def save_trade_history(trade_data: Dict[str, Any], file_path: str = "data/trade_history.jsonl"):
+    """Append one trade to the JSON Lines history file"""
     try:
         # Create data directory if it doesn't exist
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         
-        # Load existing data
-        try:
-            with open(file_path, 'r') as file:
-                trades = json.load(file)
-        except FileNotFoundError:
-            trades = []
-        
-        # Add new trade
-        trades.append(trade_data)
-        
-        # Save updated data
-        with open(file_path, 'w') as file:
-            json.dump(trades, file, indent=2, default=str)
+        # One record per line: constant-size write, earlier records never rewritten
+        with open(file_path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(trade_data, default=str) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
         
         logging.info(f"Trade saved to history: {trade_data.get('trade_id', 'Unknown')}")
         
@@ -206,15 +212,21 @@ def save_trade_history(trade_data: Dict[str, Any], file_path: str = "data/trade_
         logging.error(f"Error saving trade history: {e}")
 
 
-def load_trade_history(file_path: str = "data/trade_history.json") -> List[Dict[str, Any]]:
-    """Load trade history from file"""
+def iter_trade_history(file_path: str = "data/trade_history.jsonl") -> Iterator[Dict[str, Any]]:
+    """Yield trades one at a time from the JSON Lines history file"""
     try:
-        with open(file_path, 'r') as file:
-            trades = json.load(file)
-        return trades
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
     except FileNotFoundError:
         logging.info("No trade history file found")
-        return []
+
+
+def load_trade_history(file_path: str = "data/trade_history.jsonl") -> List[Dict[str, Any]]:
+    """Load trade history from the JSON Lines file"""
+    try:
+        return list(iter_trade_history(file_path))
     except Exception as e:
         logging.error(f"Error loading trade history: {e}")
         return []
@@ -223,17 +235,14 @@ def load_trade_history(file_path: str = "data/trade_history.json") -> List[Dict[
 def clean_old_logs(log_directory: str = "logs", days_to_keep: int = 30):
     """Clean up old log files"""
     try:
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+        cutoff = time.time() - days_to_keep * 86400
         
-        for filename in os.listdir(log_directory):
-            file_path = os.path.join(log_directory, filename)
-            
-            if os.path.isfile(file_path):
-                file_time = datetime.fromtimestamp(os.path.getctime(file_path))
-                
-                if file_time < cutoff_date:
-                    os.remove(file_path)
-                    logging.info(f"Deleted old log file: {filename}")
+        # DirEntry caches the file type and stat result: one stat per file at most
+        with os.scandir(log_directory) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False) and entry.stat().st_ctime < cutoff:
+                    os.remove(entry.path)
+                    logging.info(f"Deleted old log file: {entry.name}")
     
     except Exception as e:
         logging.error(f"Error cleaning old logs: {e}")
@@ -249,8 +258,8 @@ def create_backup(source_file: str, backup_directory: str = "backups"):
         backup_filename = f"{filename}.{timestamp}.backup"
         backup_path = os.path.join(backup_directory, backup_filename)
         
-        with open(source_file, 'r') as src, open(backup_path, 'w') as dst:
-            dst.write(src.read())
+        # Byte-for-byte copy done by the kernel where supported; keeps mtime
+        shutil.copy2(source_file, backup_path)
         
         logging.info(f"Backup created: {backup_path}")
         
@@ -264,22 +273,51 @@ class RateLimiter:
     def __init__(self, max_calls: int, time_window: int):
         self.max_calls = max_calls
         self.time_window = time_window
-        self.calls = []
+        self.calls = deque()  # (monotonic time, weight), oldest first
+        self.used = 0         # total weight inside the window
     
-    async def wait_if_needed(self):
-        """Wait if rate limit would be exceeded"""
-        now = datetime.now()
-        
-        # Remove old calls outside time window
-        self.calls = [call_time for call_time in self.calls 
-                     if now - call_time < timedelta(seconds=self.time_window)]
-        
-        # Check if we need to wait
-        if len(self.calls) >= self.max_calls:
-            sleep_time = self.time_window - (now - self.calls[0]).seconds
-            if sleep_time > 0:
-                logging.info(f"Rate limit reached, waiting {sleep_time} seconds")
-                await asyncio.sleep(sleep_time)
+    async def wait_if_needed(self, weight: int = 1):
+        """Wait if rate limit would be exceeded (weight counts as that many calls)"""
+        while True:
+            now = time.monotonic()
+            
+            # Expire calls outside time window
+            while self.calls and now - self.calls[0][0] >= self.time_window:
+                self.used -= self.calls.popleft()[1]
+            
+            # Check if we need to wait
+            if not self.calls or self.used + weight <= self.max_calls:
+                break
+            
+            sleep_time = self.time_window - (now - self.calls[0][0])
+            logging.info(f"Rate limit reached, waiting {sleep_time:.2f} seconds")
+            await asyncio.sleep(sleep_time)
         
         # Record this call
-        self.calls.append(now)
+        self.calls.append((now, weight))
+        self.used += weight
+
+
+class AsyncTokenBucket:
+    """Token bucket: refills `rate` tokens per second, bursts up to `capacity`"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self, tokens: float = 1):
+        """Wait until enough tokens are available, then take them"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                
+                await asyncio.sleep((tokens - self.tokens) / self.rate)